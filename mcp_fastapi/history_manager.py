@@ -0,0 +1,102 @@
+# history_manager.py
+
+import logging
+import os
+
+# Number of most recent history entries (user and model messages) kept verbatim
+HISTORY_KEEP_TURNS = int(os.environ.get('HISTORY_KEEP_TURNS', '10'))
+# Older entries are folded into the summary once this many extra entries have piled up
+HISTORY_COMPACT_EVERY = int(os.environ.get('HISTORY_COMPACT_EVERY', '6'))
+# Approximate token budget for the history replayed into the model
+HISTORY_TOKEN_BUDGET = int(os.environ.get('HISTORY_TOKEN_BUDGET', '3000'))
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a user and a hotel booking assistant.
+Keep every hotel ID, hotel name, location, booking, cancellation and date that was mentioned, and the user's stated preferences.
+Answer with the updated summary only, in at most 150 words.
+
+## Current summary
+{summary}
+
+## New messages
+{messages}
+"""
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+class HistoryManager:
+    """
+    Keeps conversation history bounded.
+
+    The stored session state holds the last `keep_turns` history entries
+    verbatim plus a rolling `summary` of everything older. `compact` folds the
+    overflow into the summary by awaiting `summarize(summary, turns)`, or simply
+    drops it when no summarizer is given. `build_chat_history` turns the state into
+    model chat history that fits within `token_budget`.
+    """
+
+    def __init__(self, summarize=None, keep_turns=HISTORY_KEEP_TURNS,
+                 compact_every=HISTORY_COMPACT_EVERY, token_budget=HISTORY_TOKEN_BUDGET):
+        self.summarize = summarize
+        self.keep_turns = keep_turns
+        self.compact_every = compact_every
+        self.token_budget = token_budget
+
+    def needs_compaction(self, state: dict) -> bool:
+        return len(state.get('history', [])) >= self.keep_turns + self.compact_every
+
+    async def compact(self, state: dict) -> dict:
+        """Return a new state with the overflowing turns folded into the summary."""
+        history = state.get('history', [])
+        older, recent = history[:-self.keep_turns], history[-self.keep_turns:]
+        summary = state.get('summary', '')
+        if older and self.summarize is not None:
+            try:
+                summary = await self.summarize(summary, older)
+            except Exception as e:
+                # Keep the turns rather than lose them; compaction is retried next turn
+                logging.error(f"History summarization failed: {e}")
+                return state
+        logging.info(f"Compacted {len(older)} history entries into the summary.")
+        return {**state, 'history': recent, 'summary': summary}
+
+    def build_chat_history(self, state: dict) -> list:
+        """
+        Build chat history for the model: the summary first, then as many of
+        the most recent turns as fit in the token budget.
+        """
+        summary = state.get('summary', '')
+        budget = self.token_budget
+        prefix = []
+        if summary:
+            summary_text = f"Summary of our earlier conversation:\n{summary}"
+            budget -= estimate_tokens(summary_text)
+            prefix = [
+                {'role': 'user', 'parts': [{'text': summary_text}]},
+                {'role': 'model', 'parts': [{'text': "Understood."}]},
+            ]
+
+        selected = []
+        for turn in reversed(state.get('history', [])):
+            cost = estimate_tokens(turn['text'])
+            if cost > budget:
+                break
+            budget -= cost
+            selected.append({'role': turn['role'], 'parts': [{'text': turn['text']}]})
+        selected.reverse()
+
+        # Chat history has to start with a user message
+        while selected and selected[0]['role'] != 'user':
+            selected.pop(0)
+        return prefix + selected
+
+def model_summarizer(model):
+    """Summarizer that asks a Gemini model to update the rolling summary."""
+    async def summarize(summary: str, turns: list) -> str:
+        messages = "\n".join(f"{turn['role']}: {turn['text']}" for turn in turns)
+        prompt = SUMMARY_PROMPT.format(summary=summary or "(none)", messages=messages)
+        # Async call, so summarizing does not block the chat loop's event loop
+        response = await model.generate_content_async(prompt)
+        return response.text.strip()
+    return summarize
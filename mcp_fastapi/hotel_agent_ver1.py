@@ -9,12 +9,15 @@ import logging
 import json
 import requests
 import uuid
-import psycopg2
-from psycopg2.extras import Json
 from typing import Dict, Any
 
+from session_buffer import BufferedSessionService
+from session_service import PooledSessionStore
+from history_manager import HistoryManager, model_summarizer
+from tool_registry import get_registry
+from streaming import compact_json, print_stream, starts_like_json
+
 from google.generativeai import GenerativeModel, GenerationConfig
-import yaml
 import google.generativeai as genai
 
 # 로깅 설정을 구성하여 콘솔에 정보를 출력합니다.
@@ -34,100 +37,76 @@ genai.configure(api_key=os.environ.get('DATABASE_URL'))
 # =========================================================================
 # === 데이터베이스 세션 관리 클래스 ===
 # =========================================================================
-class RelationalSessionService:
+class RelationalSessionService(PooledSessionStore):
     """
     PostgreSQL 데이터베이스에 채팅 세션을 저장하고 관리하는 클래스입니다.
-    `_get_conn`을 통해 데이터베이스 연결을 관리하고,
-    `_ensure_table_exists`를 통해 sessions 테이블의 존재를 확인합니다.
+    커넥션 풀 생성과 테이블 확인은 session_service의 PooledSessionStore를 그대로 사용하고,
+    여기서는 `user_id` 기준의 조회/갱신만 정의합니다.
     """
-    def __init__(self, db_url: str):
-        self.db_url = db_url
-        self._ensure_table_exists()
-
-    def _get_conn(self):
-        """데이터베이스 연결을 생성하고 반환합니다."""
-        return psycopg2.connect(self.db_url)
-
-    def _ensure_table_exists(self):
-        """
-        `sessions` 테이블이 존재하지 않으면 생성합니다.
-        `user_id`를 기준으로 인덱스를 생성하여 검색 성능을 향상시킵니다.
-        """
-        conn = self._get_conn()
-        try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS sessions (
-                        id VARCHAR(36) PRIMARY KEY,
-                        app_name TEXT NOT NULL,
-                        user_id TEXT NOT NULL,
-                        state JSONB,
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-                    );
-                    CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions (user_id);
-                """)
-                conn.commit()
-            logging.info("Sessions table checked/created successfully.")
-        except Exception as e:
-            logging.error(f"Database connection failed: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
 
     async def create_session(self, state: dict, app_name: str, user_id: str):
         """데이터베이스에 새로운 세션을 생성합니다."""
         session_id = str(uuid.uuid4())
-        conn = self._get_conn()
+        pool = await self._get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "INSERT INTO sessions (id, app_name, user_id, state) VALUES (%s, %s, %s, %s);",
-                    (session_id, app_name, user_id, Json(state))
-                )
-                conn.commit()
+            await pool.execute(
+                "INSERT INTO sessions (id, app_name, user_id, state) VALUES ($1, $2, $3, $4);",
+                session_id, app_name, user_id, state
+            )
             return {'id': session_id, 'app_name': app_name, 'user_id': user_id, 'state': state}
         except Exception as e:
             logging.error(f"Error creating session: {e}")
-            conn.rollback()
             raise
-        finally:
-            conn.close()
 
     async def get_session(self, user_id: str):
         """`user_id`를 기준으로 기존 세션을 데이터베이스에서 조회합니다."""
-        conn = self._get_conn()
+        pool = await self._get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute("SELECT id, app_name, user_id, state FROM sessions WHERE user_id = %s;", (user_id,))
-                row = cur.fetchone()
-                if not row:
-                    raise FileNotFoundError(f"Session for user '{user_id}' not found.")
-                
-                session_id, app_name, user_id, state = row
-                return {'id': session_id, 'app_name': app_name, 'user_id': user_id, 'state': state}
+            row = await pool.fetchrow("SELECT id, app_name, user_id, state FROM sessions WHERE user_id = $1;", user_id)
+            if not row:
+                raise FileNotFoundError(f"Session for user '{user_id}' not found.")
+
+            return {'id': row['id'], 'app_name': row['app_name'], 'user_id': row['user_id'], 'state': row['state'] or {}}
         except Exception as e:
             logging.error(f"Error getting session: {e}")
             raise
-        finally:
-            conn.close()
 
     async def update_session_state(self, user_id: str, state: dict) -> None:
-        """`user_id`를 기준으로 세션 상태를 업데이트합니다."""
-        conn = self._get_conn()
+        """`user_id`를 기준으로 세션 상태 전체를 교체합니다."""
+        pool = await self._get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "UPDATE sessions SET state = %s, updated_at = CURRENT_TIMESTAMP WHERE user_id = %s;",
-                    (Json(state), user_id)
-                )
-                conn.commit()
+            await pool.execute(
+                "UPDATE sessions SET state = $1, updated_at = CURRENT_TIMESTAMP WHERE user_id = $2;",
+                state, user_id
+            )
         except Exception as e:
             logging.error(f"Error updating session state: {e}")
-            conn.rollback()
             raise
-        finally:
-            conn.close()
+
+    async def append_history(self, user_id: str, turns: list) -> None:
+        """
+        새 대화 턴만 state['history'] 뒤에 이어 붙입니다.
+        JSONB 연산자(`||`, `jsonb_set`)로 DB에서 합치므로 전체 기록을 다시 쓰지 않습니다.
+        """
+        if not turns:
+            return
+        pool = await self._get_pool()
+        try:
+            await pool.execute(
+                """
+                UPDATE sessions
+                SET state = jsonb_set(
+                        coalesce(state, '{}'::jsonb), '{history}',
+                        coalesce(state->'history', '[]'::jsonb) || $2::jsonb
+                    ),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = $1;
+                """,
+                user_id, turns
+            )
+        except Exception as e:
+            logging.error(f"Error appending session history: {e}")
+            raise
 
 # =========================================================================
 # === 도구 호출 로직 ===
@@ -158,28 +137,15 @@ def call_tool(tool_name: str, params: Dict[str, Any]):
 # =========================================================================
 # === 모델 설정 및 프롬프트 엔지니어링 ===
 # =========================================================================
-# `tools.yaml` 파일에서 도구 정의를 로드합니다.
-with open("tools.yaml", 'r', encoding='utf-8') as f:
-    tool_definitions = yaml.safe_load(f)
-
-tool_descriptions = ""
-for tool_name, tool_def in tool_definitions.items():
-    if tool_name == 'toolsets':
-        continue
-    tool_descriptions += f"""
-### Tool: {tool_name}
-- Description: {tool_def['description']}
-- Parameters (JSON Schema):
-```json
-{json.dumps(tool_def['request_schema'], indent=2)}
-```
-"""
+# `tools.yaml`을 한 번만 읽고 검증한 뒤, 간결한 카탈로그 텍스트로 렌더링해 둡니다.
+tool_descriptions = get_registry().prompt()
+
+# 대화 모델은 사용자별 시스템 프롬프트(system_instruction)와 함께 main()에서 생성합니다.
+MODEL_NAME = 'gemini-2.0-flash-001'
 
-# Gemini 모델을 초기화합니다.
-model = GenerativeModel(
-    'gemini-2.0-flash-001',
-    generation_config=GenerationConfig(temperature=0.1)
-)
+# 오래된 대화를 요약하는 모델과 대화 기록 관리자
+summary_model = GenerativeModel(MODEL_NAME, generation_config=GenerationConfig(temperature=0.0))
+history_manager = HistoryManager(summarize=model_summarizer(summary_model))
 
 # =========================================================================
 # === 메인 실행 로직 ===
@@ -190,16 +156,19 @@ async def main():
     사용자 입력을 받고, 모델과 상호작용하며, 도구를 호출하고,
     대화 기록을 데이터베이스에 저장합니다.
     """
+    # 상태 쓰기는 메모리에 모았다가 백그라운드에서 일괄 저장합니다(write-behind).
+    session_service = BufferedSessionService(
+        RelationalSessionService(os.environ['DATABASE_URL']), key_column='user_id'
+    )
     try:
-        session_service = RelationalSessionService(os.environ['DATABASE_URL'])
-        user_id = input("사용자 ID를 입력하세요: ")
+        user_id = await asyncio.to_thread(input, "사용자 ID를 입력하세요: ")
 
         print("안녕하세요, 호텔 예약 어시스턴트입니다. 도움을 원하시면 언제든지 말씀해주세요. (종료하려면 '종료' 또는 'exit' 입력)")
 
         try:
             # 기존 세션 로드 시도
             current_session_data = await session_service.get_session(user_id)
-            history = current_session_data['state'].get('history', [])
+            state = current_session_data['state']
             logging.info(f"기존 세션 로드 완료. 세션 ID: {current_session_data['id']}")
         except FileNotFoundError:
             # 기존 세션이 없으면 새로 생성
@@ -208,21 +177,10 @@ async def main():
                 app_name='hotel_agent',
                 user_id=user_id
             )
-            history = []
+            state = {'history': []}
             logging.info(f"새로운 세션 생성 완료. 세션 ID: {current_session_data['id']}")
         
-        # 데이터베이스의 기록을 모델이 이해할 수 있는 형식으로 변환합니다.
-        formatted_history = []
-        for turn in history:
-            formatted_history.append({
-                'role': turn['role'],
-                'parts': [{'text': turn['text']}]
-            })
-            
-        # ChatSession을 초기화하고 기록을 제공합니다.
-        chat = model.start_chat(history=formatted_history)
-
-        # 시스템 프롬프트는 대화의 첫 번째 메시지로만 보냅니다.
+        # 시스템 프롬프트는 대화 기록에 넣지 않고 system_instruction으로 전달합니다.
         system_prompt = f"""
 You are a helpful hotel assistant. You handle hotel searching, booking, and cancellations.
 When the user searches for a hotel, mention its name, id, location, and price tier.
@@ -255,20 +213,30 @@ Response:
 }}
 ```
 """
-        if not formatted_history:
-            chat.send_message(system_prompt)
+        model = GenerativeModel(
+            MODEL_NAME,
+            generation_config=GenerationConfig(temperature=0.1),
+            system_instruction=system_prompt
+        )
+
+        # 요약과 최근 대화만 토큰 예산 안에서 모델 기록으로 사용합니다.
+        chat = model.start_chat(history=history_manager.build_chat_history(state))
+        # 이미 데이터베이스에 저장된 턴 수
+        saved_turns = len(chat.history)
 
         # 메인 대화 루프
         while True:
-            query = input(f"\n[{user_id}]: ")
+            # input()은 별도 스레드에서 기다려, 사용자가 입력하는 동안에도 이벤트 루프(세션 버퍼 flush 등)가 돌게 합니다.
+            query = await asyncio.to_thread(input, f"\n[{user_id}]: ")
             if query.lower() in ['종료', 'exit']:
                 print("[AGENT]: 감사합니다. 다음에 또 만나요!")
                 break
 
             try:
-                # 1단계: 사용자 입력에 대한 모델의 첫 번째 응답을 받습니다.
-                response = chat.send_message(query)
-                model_text = response.text.strip()
+                # 1단계: 사용자 입력에 대한 모델의 첫 번째 응답을 스트리밍으로 받습니다.
+                # 일반 대화는 생성되는 즉시 출력하고, JSON(도구 호출)으로 보이는 응답은 모아 둡니다.
+                response = await chat.send_message_async(query, stream=True)
+                model_text = await print_stream(response, hold_json=True)
                 
                 final_response_text = ""
 
@@ -280,7 +248,7 @@ Response:
                     
                     if tool_name:
                         # 사용자 요청에 따라 도구 호출 JSON을 출력합니다.
-                        print(f"[AGENT]: ```json\n{json.dumps(tool_call, indent=2)}\n```")
+                        print(f"[AGENT]: ```json\n{compact_json(tool_call)}\n```")
                         
                         logging.info(f"✅ 도구 호출 감지: {tool_name} with params {params}")
                         
@@ -289,38 +257,51 @@ Response:
                         logging.info(f"✅ 도구 실행 성공: {tool_result}")
 
                         # 3단계: 도구 실행 결과와 함께 최종 응답을 요청합니다.
-                        tool_result_content = json.dumps(tool_result, ensure_ascii=False)
+                        tool_result_content = compact_json(tool_result)
                         
                         # 모델에게 도구 결과를 바탕으로 자연어 답변을 생성하도록 명시적으로 지시합니다.
                         final_prompt = f"The previous tool call to '{tool_name}' returned the following result:\n{tool_result_content}\n\nBased on this result, please provide a clear and conversational final response to the user's query. Do not output any JSON or code blocks."
                         
-                        final_response = chat.send_message(final_prompt)
-                        final_response_text = final_response.text.strip()
+                        final_response = await chat.send_message_async(final_prompt, stream=True)
+                        final_response_text = await print_stream(final_response)
                     else:
                         final_response_text = model_text
 
-                except (json.JSONDecodeError, KeyError):
+                except (json.JSONDecodeError, KeyError, AttributeError):
                     # 모델 응답이 JSON이 아닐 경우 (일반 대화인 경우)
                     final_response_text = model_text
-                
-                if final_response_text:
+
+                # 모아 두었지만 도구 호출이 아니었던 응답은 여기서 출력합니다.
+                if final_response_text and final_response_text == model_text and starts_like_json(model_text):
                     print(f"[AGENT]: {final_response_text}")
                 
             except Exception as e:
                 logging.error(f"예상치 못한 오류가 발생했습니다: {e}")
                 print("[AGENT]: 죄송합니다. 처리 중 오류가 발생했습니다. 다시 시도해주세요.")
             
-            # 대화 기록을 데이터베이스에 저장합니다.
+            # 아직 저장하지 않은 대화 턴만 데이터베이스에 이어 붙입니다.
             db_history = []
-            for turn in chat.history:
+            for turn in chat.history[saved_turns:]:
                 if turn.role in ['user', 'model'] and turn.parts:
                     text_part = [part.text for part in turn.parts if hasattr(part, 'text')]
                     if text_part:
                         db_history.append({'role': turn.role, 'text': text_part[0]})
-            await session_service.update_session_state(user_id, {'history': db_history})
+            await session_service.append_history(user_id, db_history)
+            state = {**state, 'history': state.get('history', []) + db_history}
+
+            # 기록이 길어지면 오래된 턴을 요약으로 접어 세션 크기를 제한합니다.
+            if history_manager.needs_compaction(state):
+                state = await history_manager.compact(state)
+                await session_service.update_session_state(user_id, state)
+
+            # 다음 턴의 프롬프트도 토큰 예산 안에 들도록 채팅을 다시 구성합니다.
+            chat = model.start_chat(history=history_manager.build_chat_history(state))
+            saved_turns = len(chat.history)
 
     except Exception as e:
         logging.error(f"메인 함수 실행 중 예상치 못한 오류가 발생했습니다: {e}")
+    finally:
+        await session_service.close()
         
 if __name__ == "__main__":
     asyncio.run(main())
@@ -7,14 +7,18 @@ import asyncio
 import os
 import logging
 import json
-import requests
+import httpx
 import uuid
-import psycopg2
-from psycopg2.extras import Json
 from typing import Dict, Any
 
+from session_buffer import BufferedSessionService
+from session_service import PooledSessionStore
+from history_manager import HistoryManager
+from tool_registry import get_registry
+from intent_router import IntentRouter
+from streaming import compact_json, print_stream
+
 from google.generativeai import GenerativeModel, GenerationConfig
-import yaml
 import google.generativeai as genai
 
 # 로깅 설정을 구성하여 콘솔에 정보를 출력합니다.
@@ -32,11 +36,33 @@ genai.configure(api_key=os.environ.get('GOOGLE_API_KEY'))
 # =========================================================================
 # === 모델 설정 (두 개의 모델 사용) ===
 # =========================================================================
+# tools.yaml은 한 번만 읽고 검증한 뒤, 간결한 카탈로그 텍스트로 렌더링해 둡니다.
+tool_registry = get_registry()
+# 자주 쓰이는 명확한 요청("book hotel 3", "2번 예약 취소" 등)은 모델 호출 없이 로컬에서 도구를 결정합니다.
+intent_router = IntentRouter(tool_registry)
+
+# 도구 선택 지침과 카탈로그는 매 턴 프롬프트에 다시 넣지 않고 system_instruction으로 고정합니다.
+TOOL_SELECTION_INSTRUCTION = f"""
+Based on the user's intent, decide which tools need to be called.
+A request can need several independent tool calls (e.g. searching two locations).
+If no tool is needed, respond with an empty JSON array.
+
+## Available Tools
+{tool_registry.prompt()}
+
+## Instructions
+- Respond ONLY with a JSON array of tool call objects.
+- Each object MUST contain "tool" and "parameters" keys.
+- "tool" must be a valid tool name.
+- The "parameters" key must be a JSON object containing the parameters for the tool.
+"""
+
 # 1. 도구 호출 결정을 위한 모델:
 #    JSON 응답을 정확하고 빠르게 생성하기 위해 낮은 온도(0.0)를 사용합니다.
 tool_model = GenerativeModel(
     'gemini-2.0-flash-001',
-    generation_config=GenerationConfig(temperature=0.0)
+    generation_config=GenerationConfig(temperature=0.0),
+    system_instruction=TOOL_SELECTION_INSTRUCTION
 )
 # 2. 최종 대화 생성을 위한 모델:
 #    자연스럽고 풍부한 대화체 응답을 생성하기 위해 더 높은 온도(0.7)를 사용합니다.
@@ -45,137 +71,142 @@ conversational_model = GenerativeModel(
     generation_config=GenerationConfig(temperature=0.7)
 )
 
-# 툴 정의를 가져와서 프롬프트에 포함시킵니다.
-with open("tools.yaml", 'r', encoding='utf-8') as f:
-    tool_definitions = yaml.safe_load(f)
-
-tool_descriptions = ""
-for tool_name, tool_def in tool_definitions.items():
-    if tool_name == 'toolsets':
-        continue
-    tool_descriptions += f"""
-### Tool: {tool_name}
-- Description: {tool_def['description']}
-- Parameters (JSON Schema):
-```json
-{json.dumps(tool_def['request_schema'], indent=2)}
-```
-"""
+# 대화 모델은 이전 기록을 사용하지 않으므로, 오래된 턴은 요약 없이 잘라내 세션 크기만 제한합니다.
+history_manager = HistoryManager()
 
 # =========================================================================
 # === 세션 및 API 서비스 클래스 ===
 # =========================================================================
-class RelationalSessionService:
+class RelationalSessionService(PooledSessionStore):
     """
     PostgreSQL 데이터베이스에 채팅 세션을 저장하고 관리하는 클래스입니다.
+    커넥션 풀 생성과 테이블 확인은 session_service의 PooledSessionStore를 그대로 사용하고,
+    여기서는 `user_id` 기준의 조회/갱신만 정의합니다.
     """
-    def __init__(self, db_url: str):
-        self.db_url = db_url
-        self._ensure_table_exists()
-
-    def _get_conn(self):
-        """데이터베이스 연결을 생성하고 반환합니다."""
-        return psycopg2.connect(self.db_url)
-
-    def _ensure_table_exists(self):
-        """sessions 테이블이 존재하지 않으면 생성합니다."""
-        conn = self._get_conn()
-        try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS sessions (
-                        id VARCHAR(36) PRIMARY KEY,
-                        app_name TEXT NOT NULL,
-                        user_id TEXT NOT NULL,
-                        state JSONB,
-                        created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-                    );
-                    CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions (user_id);
-                """)
-                conn.commit()
-            logging.info("Sessions table checked/created successfully.")
-        except Exception as e:
-            logging.error(f"Database connection failed: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
 
     async def create_session(self, state: dict, app_name: str, user_id: str):
         """데이터베이스에 새로운 세션을 생성합니다."""
         session_id = str(uuid.uuid4())
-        conn = self._get_conn()
+        pool = await self._get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "INSERT INTO sessions (id, app_name, user_id, state) VALUES (%s, %s, %s, %s);",
-                    (session_id, app_name, user_id, Json(state))
-                )
-                conn.commit()
+            await pool.execute(
+                "INSERT INTO sessions (id, app_name, user_id, state) VALUES ($1, $2, $3, $4);",
+                session_id, app_name, user_id, state
+            )
             return {'id': session_id, 'app_name': app_name, 'user_id': user_id, 'state': state}
         except Exception as e:
             logging.error(f"Error creating session: {e}")
-            conn.rollback()
             raise
-        finally:
-            conn.close()
 
     async def get_session(self, user_id: str):
         """`user_id`를 기준으로 기존 세션을 데이터베이스에서 조회합니다."""
-        conn = self._get_conn()
+        pool = await self._get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute("SELECT id, app_name, user_id, state FROM sessions WHERE user_id = %s;", (user_id,))
-                row = cur.fetchone()
-                if not row:
-                    raise FileNotFoundError(f"Session for user '{user_id}' not found.")
-                
-                session_id, app_name, user_id, state = row
-                return {'id': session_id, 'app_name': app_name, 'user_id': user_id, 'state': state}
+            row = await pool.fetchrow("SELECT id, app_name, user_id, state FROM sessions WHERE user_id = $1;", user_id)
+            if not row:
+                raise FileNotFoundError(f"Session for user '{user_id}' not found.")
+
+            return {'id': row['id'], 'app_name': row['app_name'], 'user_id': row['user_id'], 'state': row['state'] or {}}
         except Exception as e:
             logging.error(f"Error getting session: {e}")
             raise
-        finally:
-            conn.close()
 
     async def update_session_state(self, user_id: str, state: dict) -> None:
-        """`user_id`를 기준으로 세션 상태를 업데이트합니다."""
-        conn = self._get_conn()
+        """`user_id`를 기준으로 세션 상태 전체를 교체합니다."""
+        pool = await self._get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "UPDATE sessions SET state = %s, updated_at = CURRENT_TIMESTAMP WHERE user_id = %s;",
-                    (Json(state), user_id)
-                )
-                conn.commit()
+            await pool.execute(
+                "UPDATE sessions SET state = $1, updated_at = CURRENT_TIMESTAMP WHERE user_id = $2;",
+                state, user_id
+            )
         except Exception as e:
             logging.error(f"Error updating session state: {e}")
-            conn.rollback()
             raise
-        finally:
-            conn.close()
 
-def call_tool(tool_name: str, params: Dict[str, Any]):
+    async def append_history(self, user_id: str, turns: list) -> None:
+        """
+        새 대화 턴만 state['history'] 뒤에 이어 붙입니다.
+        JSONB 연산자(`||`, `jsonb_set`)로 DB에서 합치므로 전체 기록을 다시 쓰지 않습니다.
+        """
+        if not turns:
+            return
+        pool = await self._get_pool()
+        try:
+            await pool.execute(
+                """
+                UPDATE sessions
+                SET state = jsonb_set(
+                        coalesce(state, '{}'::jsonb), '{history}',
+                        coalesce(state->'history', '[]'::jsonb) || $2::jsonb
+                    ),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = $1;
+                """,
+                user_id, turns
+            )
+        except Exception as e:
+            logging.error(f"Error appending session history: {e}")
+            raise
+
+def tool_http_method(tool_name: str) -> str:
+    """tools.yaml에 정의된 HTTP 메서드를 반환합니다."""
+    return tool_registry.http_method(tool_name)
+
+async def call_tool(client: httpx.AsyncClient, tool_name: str, params: Dict[str, Any]):
     """
-    FastAPI 서버의 도구 함수를 호출합니다.
+    FastAPI 서버의 도구 함수를 비동기로 호출합니다.
     """
     url = f"http://127.0.0.1:8000/{tool_name}" # 수정된 부분: .replace('-', '_') 제거
 
-    http_method = "GET"
-    if "book" in tool_name or "cancel" in tool_name or "update" in tool_name:
-        http_method = "POST"
-
     try:
-        if http_method == "GET":
-            response = requests.get(url, params=params)
+        if tool_http_method(tool_name) == "GET":
+            response = await client.get(url, params=params)
         else:
-            response = requests.post(url, json=params)
+            response = await client.post(url, json=params)
 
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         return {"error": f"API 호출 실패: {e}"}
 
+def parse_tool_calls(text: str) -> list:
+    """
+    도구 모델의 응답에서 도구 호출 목록을 추출합니다.
+    JSON 배열, 단일 객체 모두 허용하며 "tool": "none" 항목은 제외합니다.
+    """
+    text = text.strip().strip('`').strip()
+    if text.startswith('json'):
+        text = text[len('json'):].strip()
+    parsed = json.loads(text)
+    if isinstance(parsed, dict):
+        parsed = [parsed]
+    return [call for call in parsed if isinstance(call, dict) and call.get('tool') not in (None, 'none')]
+
+async def run_tool_calls(client: httpx.AsyncClient, tool_calls: list) -> list:
+    """
+    도구 호출들을 요청된 순서대로 실행하고 같은 순서로 결과를 반환합니다.
+    연속된 조회(GET) 도구끼리만 동시에 실행하고, 상태를 바꾸는(POST) 도구는 앞선 호출이
+    모두 끝난 뒤 하나씩 실행합니다. 그래서 쓰기 뒤의 조회는 항상 쓰기 결과를 봅니다.
+    """
+    results = []
+    reads = []
+
+    async def flush_reads():
+        if reads:
+            results.extend(await asyncio.gather(
+                *(call_tool(client, call['tool'], call['parameters']) for call in reads)
+            ))
+            reads.clear()
+
+    for call in tool_calls:
+        if tool_http_method(call['tool']) == "GET":
+            reads.append(call)
+        else:
+            await flush_reads()
+            results.append(await call_tool(client, call['tool'], call['parameters']))
+    await flush_reads()
+    return results
+
 # =========================================================================
 # === 메인 실행 로직 (2-모델 방식) ===
 # =========================================================================
@@ -184,10 +215,15 @@ async def main():
     호텔 에이전트의 메인 실행 루프입니다.
     사용자 입력을 받고, 도구를 호출하거나 대화를 생성합니다.
     """
+    # 데이터베이스 세션 서비스를 초기화합니다.
+    # 상태 쓰기는 메모리에 모았다가 백그라운드에서 일괄 저장합니다(write-behind).
+    session_service = BufferedSessionService(
+        RelationalSessionService(os.environ['DATABASE_URL']), key_column='user_id'
+    )
+    # 도구 API 호출에 재사용할 비동기 HTTP 클라이언트
+    http_client = httpx.AsyncClient(timeout=10.0)
     try:
-        # 데이터베이스 세션 서비스를 초기화합니다.
-        session_service = RelationalSessionService(os.environ['DATABASE_URL'])
-        user_id = input("사용자 ID를 입력하세요: ")
+        user_id = await asyncio.to_thread(input, "사용자 ID를 입력하세요: ")
 
         print("안녕하세요, 호텔 예약 어시스턴트입니다. 도움을 원하시면 언제든지 말씀해주세요. (종료하려면 '종료' 또는 'exit' 입력)")
 
@@ -208,89 +244,91 @@ async def main():
 
         # 메인 대화 루프
         while True:
-            query = input(f"\n[{user_id}]: ")
+            # input()은 별도 스레드에서 기다려, 사용자가 입력하는 동안에도 이벤트 루프(세션 버퍼 flush 등)가 돌게 합니다.
+            query = await asyncio.to_thread(input, f"\n[{user_id}]: ")
             if query.lower() in ['종료', 'exit']:
                 print("[AGENT]: 감사합니다. 다음에 또 만나요!")
                 break
 
-            # 1단계: tool_model을 사용해 도구 호출을 결정합니다.
-            tool_prompt = f"""
-            Based on the user's intent, decide if a tool needs to be called.
-            If a tool is needed, respond with a single JSON object.
-            If no tool is needed, respond with a JSON object with "tool": "none".
-            
-            ## Available Tools
-            {tool_descriptions}
-            
-            ## Instructions
-            - Respond ONLY with a single JSON object.
-            - The JSON object MUST contain "tool" and "parameters" keys.
-            - "tool" must be a valid tool name or "none".
-            - The "parameters" key must be a JSON object containing the parameters for the tool.
-            
-            ## User Request
-            {query}
-            """
-            
-            tool_call = {"tool": "none"}
-            try:
-                tool_response = tool_model.generate_content(tool_prompt)
-                tool_call_text = tool_response.text.strip().strip('`').strip('json').strip()
-                tool_call = json.loads(tool_call_text)
-            except Exception as e:
-                logging.error(f"도구 모델 오류: {e}")
-                tool_call = {"tool": "none"}
+            # 1단계: 확신도가 높은 요청은 로컬 라우터가 바로 도구 호출을 결정하고,
+            # 애매한 요청만 tool_model에 넘깁니다.
+            route = intent_router.route(query)
+            if route is not None:
+                tool_calls = route.tool_calls
+            else:
+                # 도구 카탈로그는 system_instruction에 있으므로 사용자 요청만 보냅니다.
+                tool_prompt = f"## User Request\n{query}"
+
+                tool_calls = []
+                try:
+                    tool_response = await tool_model.generate_content_async(tool_prompt)
+                    tool_calls = parse_tool_calls(tool_response.text)
+                except Exception as e:
+                    logging.error(f"도구 모델 오류: {e}")
+                    tool_calls = []
 
             final_response_text = ""
-            if tool_call['tool'] != "none":
+            if tool_calls:
                 # 도구 호출이 필요한 경우
-                tool_name = tool_call['tool']
-                params = tool_call.get('parameters', {})
-                params['user_id'] = user_id
+                for call in tool_calls:
+                    call['parameters'] = call.get('parameters') or {}
+                    call['parameters']['user_id'] = user_id
                 
                 # 도구 호출 JSON을 출력합니다.
-                print(f"[AGENT]: ```json\n{json.dumps(tool_call, indent=2)}\n```")
+                print(f"[AGENT]: ```json\n{compact_json(tool_calls)}\n```")
                 
-                logging.info(f"✅ 도구 호출 감지: {tool_name} with params {params}")
+                logging.info(f"✅ 도구 호출 감지: {[call['tool'] for call in tool_calls]}")
                 
-                # 도구를 실행하고 결과를 받습니다.
-                tool_result = call_tool(tool_name, params)
-                logging.info(f"✅ 도구 실행 성공: {tool_result}")
+                # 도구들을 한 번에 실행하고 결과를 받습니다.
+                tool_results = await run_tool_calls(http_client, tool_calls)
+                logging.info(f"✅ 도구 실행 성공: {tool_results}")
 
-                # 2단계: conversational_model을 사용해 최종 답변을 생성합니다.
+                # 2단계: conversational_model을 사용해 모든 결과를 한 번에 반영한 최종 답변을 생성합니다.
+                results_text = "\n".join(
+                    f"- Tool Name: {call['tool']}\n  Parameters: {compact_json(call['parameters'])}\n"
+                    f"  Result: {compact_json(result)}"
+                    for call, result in zip(tool_calls, tool_results)
+                )
                 final_prompt = f"""
-                Based on the user's last request and the following tool result, provide a final, conversational response.
+                Based on the user's last request and the following tool results, provide a final, conversational response.
                 The response must be in natural language, not JSON. Do not include any tool-related details.
                 
                 ## User's Last Request
                 {query}
                 
-                ## Tool Result
-                - Tool Name: {tool_name}
-                - Result:
-                ```json
-                {json.dumps(tool_result, indent=2)}
-                ```
+                ## Tool Results
+                {results_text}
                 """
                 
-                final_response = conversational_model.generate_content(final_prompt)
-                final_response_text = final_response.text.strip()
+                # 응답은 스트리밍으로 받아 생성되는 즉시 출력합니다.
+                final_response = await conversational_model.generate_content_async(final_prompt, stream=True)
+                final_response_text = await print_stream(final_response)
                 
             else:
-                # 도구 호출이 필요 없는 경우, 일반 대화를 생성합니다.
-                final_response = conversational_model.generate_content(query)
-                final_response_text = final_response.text.strip()
+                # 도구 호출이 필요 없는 경우, 일반 대화를 스트리밍으로 생성합니다.
+                final_response = await conversational_model.generate_content_async(query, stream=True)
+                final_response_text = await print_stream(final_response)
             
-            # 최종 응답을 출력하고 대화 기록을 업데이트합니다.
+            # 스트리밍으로 이미 출력한 최종 응답을 대화 기록에 반영합니다.
             if final_response_text:
-                print(f"[AGENT]: {final_response_text}")
-                history.append({'role': 'user', 'text': query})
-                history.append({'role': 'model', 'text': final_response_text})
-            
-            await session_service.update_session_state(user_id, {'history': history})
+                new_turns = [
+                    {'role': 'user', 'text': query},
+                    {'role': 'model', 'text': final_response_text}
+                ]
+                history.extend(new_turns)
+                # 이번 턴만 DB에 이어 붙입니다.
+                await session_service.append_history(user_id, new_turns)
+
+                state = {'history': history}
+                if history_manager.needs_compaction(state):
+                    history = (await history_manager.compact(state))['history']
+                    await session_service.update_session_state(user_id, {'history': history})
 
     except Exception as e:
         logging.error(f"메인 함수 실행 중 예상치 못한 오류가 발생했습니다: {e}")
+    finally:
+        await http_client.aclose()
+        await session_service.close()
         
 if __name__ == "__main__":
     asyncio.run(main())
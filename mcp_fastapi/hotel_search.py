@@ -0,0 +1,117 @@
+# hotel_search.py
+
+import os
+import asyncio
+import logging
+
+# Default and maximum number of hotels returned by one search call
+SEARCH_DEFAULT_LIMIT = int(os.environ.get('HOTEL_SEARCH_DEFAULT_LIMIT', '20'))
+SEARCH_MAX_LIMIT = int(os.environ.get('HOTEL_SEARCH_MAX_LIMIT', '100'))
+# Also create pg_trgm and the search indexes at server startup (requires CREATE privileges).
+# Off by default; run `python hotel_search.py` once as a migration instead.
+SEARCH_PROVISION = os.environ.get('HOTEL_SEARCH_PROVISION', 'false').lower() in ('1', 'true', 'yes')
+
+# Columns that can be searched, with the trigram index backing each one
+SEARCH_COLUMNS = {
+    "name": "hotels_name_trgm_idx",
+    "location": "hotels_location_trgm_idx",
+}
+
+class HotelSearch:
+    """
+    Ranked substring and fuzzy search over hotels.name and hotels.location.
+
+    With the pg_trgm extension and its GIN indexes in place, both the ILIKE
+    substring match and the trigram similarity match (`%`) are index scans, and
+    results are ranked by similarity. A column whose index is missing or not
+    yet valid falls back to a plain ILIKE ordered by id.
+    """
+
+    def __init__(self):
+        self.trigram_columns = set()
+
+    async def setup(self, conn):
+        """Optionally provision the indexes, then detect which columns can use trigram search."""
+        if SEARCH_PROVISION:
+            try:
+                await provision(conn)
+            except Exception as e:
+                logging.warning(f"Could not provision trigram search indexes: {e}")
+
+        # Trigram matching is only worth it where the index itself is in place and valid
+        rows = await conn.fetch("""
+            SELECT c.relname
+            FROM pg_index x
+            JOIN pg_class c ON c.oid = x.indexrelid
+            WHERE x.indrelid = to_regclass('hotels') AND c.relname = ANY($1::text[]) AND x.indisvalid
+              AND EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm');
+        """, list(SEARCH_COLUMNS.values()))
+        indexes = {row['relname'] for row in rows}
+        self.trigram_columns = {column for column, index in SEARCH_COLUMNS.items() if index in indexes}
+        logging.info(f"Hotel search using trigram matching for {sorted(self.trigram_columns)}, ILIKE otherwise.")
+
+    async def search(self, conn, column, term, limit=None, offset=0):
+        """
+        Search hotels whose `column` contains or closely resembles `term`.
+
+        Returns:
+            List of hotel rows as dictionaries, best matches first
+        """
+        if column not in SEARCH_COLUMNS:
+            raise ValueError(f"Unsupported search column: {column}")
+        limit = min(max(limit or SEARCH_DEFAULT_LIMIT, 1), SEARCH_MAX_LIMIT)
+        offset = max(offset, 0)
+
+        # Match the term literally, not as a LIKE pattern
+        pattern = '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+        if column in self.trigram_columns:
+            rows = await conn.fetch(f"""
+                SELECT * FROM hotels
+                WHERE {column} ILIKE $1 OR {column} % $2
+                ORDER BY similarity({column}, $2) DESC, id
+                LIMIT $3 OFFSET $4;
+            """, pattern, term, limit, offset)
+        else:
+            rows = await conn.fetch(f"""
+                SELECT * FROM hotels
+                WHERE {column} ILIKE $1
+                ORDER BY id
+                LIMIT $2 OFFSET $3;
+            """, pattern, limit, offset)
+        return [dict(row) for row in rows]
+
+async def provision(conn):
+    """
+    Create pg_trgm and the trigram GIN indexes on hotels.
+
+    The indexes are built with CREATE INDEX CONCURRENTLY, so writes to hotels
+    are not blocked while they build. A build that failed earlier leaves an
+    invalid index behind; it is dropped and built again.
+    """
+    await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    for column, index in SEARCH_COLUMNS.items():
+        invalid = await conn.fetchval("""
+            SELECT NOT x.indisvalid FROM pg_index x JOIN pg_class c ON c.oid = x.indexrelid
+            WHERE c.oid = to_regclass($1);
+        """, index)
+        if invalid:
+            await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index};")
+        await conn.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} ON hotels USING gin ({column} gin_trgm_ops);"
+        )
+        logging.info(f"Trigram index {index} is in place.")
+
+async def main():
+    import asyncpg
+
+    # Migration step: a dedicated connection without the server's command timeout
+    conn = await asyncpg.connect(os.environ.get('DATABASE_URL'))
+    try:
+        await provision(conn)
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    asyncio.run(main())
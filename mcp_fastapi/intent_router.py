@@ -0,0 +1,126 @@
+# intent_router.py
+
+import os
+import re
+import logging
+
+# Minimum confidence for a local route to replace the tool-selection model call
+INTENT_ROUTER_MIN_CONFIDENCE = float(os.environ.get('INTENT_ROUTER_MIN_CONFIDENCE', '0.8'))
+
+# Turns that ask for several things or negate the request always go to the model
+AMBIGUOUS = re.compile(
+    r"\b(and|then|also|not|don't|dont|instead)\b|,|그리고|하고 나서|및|랑|말고|하지 ?마|안 ",
+    re.IGNORECASE
+)
+
+# Turns that mention booking, cancelling or changing a reservation always go to the model.
+# Write tools are never called from the fast path: a misread id books or cancels the wrong hotel.
+WRITE_INTENT = re.compile(
+    r"\b(book\w*|reserv\w*|cancel\w*|update\w*|change|modify)\b|예약|취소|변경|수정",
+    re.IGNORECASE
+)
+
+# (tool, confidence, pattern). Named groups become the tool parameters.
+# An empty tool name means "no tool needed" (small talk). Only read-only tools belong here.
+RULES = [
+    ("search-hotels-by-location", 0.9, re.compile(
+        r"^(?:(?:show|find|search|list)(?:\s+me)?\s+(?:for\s+)?)?(?:the\s+|all\s+)?hotels?\s+(?:in|near|around)\s+"
+        r"(?P<location>[A-Za-z][A-Za-z'-]*(?:\s+[A-Za-z][A-Za-z'-]*){0,2})\s*[?.!]*$", re.IGNORECASE)),
+    ("search-hotels-by-location", 0.9, re.compile(r"^(?P<location>\S+?)(?:에 있는|에서|의|에)\s*호텔")),
+    ("search-hotels-by-name", 0.9, re.compile(r"\bhotels?\s+(?:named|called)\s+(?P<name>.+?)\s*[?.!]*$", re.IGNORECASE)),
+    ("search-hotels-by-name", 0.9, re.compile(r"^(?P<name>.+?)(?:이라는|라는)\s*호텔")),
+    ("list-all-tables", 0.9, re.compile(r"\b(?:list|show)\s+(?:all\s+)?tables\b|테이블\s*목록", re.IGNORECASE)),
+    ("", 0.9, re.compile(r"^\s*(?:hi|hello|hey|thanks|thank you|bye|안녕(?:하세요)?|고마워(?:요)?|감사합니다)\s*[!.?~]*\s*$", re.IGNORECASE)),
+]
+
+# Words that show a captured location is not a bare place name ("hotels near me",
+# "hotels in Basel with a pool"); such turns go to the model
+NOT_A_PLACE = {
+    "me", "my", "here", "there", "us", "you", "this", "that", "which", "where", "with", "without",
+    "are", "is", "for", "cheap", "best", "good", "downtown", "city", "center", "centre", "area",
+    "근처", "주변", "여기", "거기", "가까운", "내",
+}
+
+WORD = re.compile(r"[A-Za-z]+|[가-힣]+")
+
+class RouteDecision:
+    """A locally decided set of tool calls (empty for turns that need no tool)."""
+
+    def __init__(self, tool_calls, confidence, rule):
+        self.tool_calls = tool_calls
+        self.confidence = confidence
+        self.rule = rule
+
+class IntentRouter:
+    """
+    Cheap pre-router in front of the tool-selection model.
+
+    Regex rules (English and Korean) recognise the common single-intent
+    read-only turns (searches, table listing, small talk) and extract their
+    parameters; bookings, cancellations and updates are always left to the
+    model. Locations are only taken when they are a bare place name. A
+    keyword-overlap score against the tool descriptions in tools.yaml acts as
+    a second opinion: when another tool matches the wording better, the rule's
+    confidence drops below the threshold. `route` returns None for anything not clearly matched, and the
+    caller falls back to the model.
+    """
+
+    def __init__(self, registry, min_confidence=INTENT_ROUTER_MIN_CONFIDENCE):
+        self.registry = registry
+        self.min_confidence = min_confidence
+        self._keywords = {
+            name: self._words(name.replace('-', ' ') + ' ' + definition.get('description', ''))
+            for name, definition in registry.tools.items()
+        }
+        self.routed = 0
+        self.fallbacks = 0
+
+    @staticmethod
+    def _words(text):
+        return {word.lower() for word in WORD.findall(text) if len(word) > 2}
+
+    def _best_keyword_match(self, query):
+        words = self._words(query)
+        scores = {name: len(words & keywords) for name, keywords in self._keywords.items()}
+        return max(scores, key=scores.get), scores
+
+    def route(self, query: str):
+        """Return a RouteDecision for a high-confidence intent, otherwise None."""
+        query = query.strip()
+        matches = []
+        for tool, confidence, pattern in RULES:
+            match = pattern.search(query)
+            if match:
+                matches.append((tool, confidence, pattern, match))
+
+        if (not matches or len({tool for tool, *_ in matches}) > 1
+                or AMBIGUOUS.search(query) or WRITE_INTENT.search(query)):
+            self.fallbacks += 1
+            return None
+
+        tool, confidence, pattern, match = matches[0]
+        location = match.groupdict().get('location')
+        if location and any(word.lower() in NOT_A_PLACE for word in WORD.findall(location)):
+            self.fallbacks += 1
+            return None
+        if tool:
+            # Only GET tools are safe to call without the model's judgement
+            if tool not in self.registry.tools or self.registry.http_method(tool) != 'GET':
+                self.fallbacks += 1
+                return None
+            _, scores = self._best_keyword_match(query)
+            if max(scores.values()) > scores[tool]:
+                confidence = min(confidence, 0.6)
+
+        if confidence < self.min_confidence:
+            self.fallbacks += 1
+            return None
+
+        tool_calls = []
+        if tool:
+            parameters = {key: value.strip() for key, value in match.groupdict().items() if value}
+            tool_calls.append({'tool': tool, 'parameters': parameters})
+
+        self.routed += 1
+        logging.info(f"Intent routed locally to {tool or 'no tool'} (confidence {confidence}).")
+        return RouteDecision(tool_calls, confidence, pattern.pattern)
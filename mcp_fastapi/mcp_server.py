@@ -1,31 +1,46 @@
 # mcp_server.py
 
 from fastapi import FastAPI, Request, HTTPException
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
-from typing import Dict, Any
-import yaml
+from typing import Dict, Any, Optional
+import asyncio
+import os
+from tool_registry import get_registry
 import logging
-import requests
+import httpx
 
 logging.basicConfig(level=logging.INFO)
 
+# Outgoing HTTP settings for tool calls
+TOOL_DEFAULT_TIMEOUT = float(os.environ.get('TOOL_DEFAULT_TIMEOUT', '10'))
+TOOL_MAX_CONNECTIONS = int(os.environ.get('TOOL_MAX_CONNECTIONS', '100'))
+TOOL_GET_RETRIES = int(os.environ.get('TOOL_GET_RETRIES', '2'))
+TOOL_RETRY_BACKOFF = float(os.environ.get('TOOL_RETRY_BACKOFF', '0.2'))
+
+# Shared client; keeps connections to the tool APIs alive between calls
+http_client: Optional[httpx.AsyncClient] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global http_client
+    http_client = httpx.AsyncClient(
+        timeout=TOOL_DEFAULT_TIMEOUT,
+        limits=httpx.Limits(max_connections=TOOL_MAX_CONNECTIONS, max_keepalive_connections=TOOL_MAX_CONNECTIONS)
+    )
+    try:
+        yield
+    finally:
+        await http_client.aclose()
+
 app = FastAPI(
     title="Custom MCP Server",
     description="A custom server to expose tools from a tools.yaml file.",
+    lifespan=lifespan
 )
 
-# Load tool definitions from the tools.yaml file
-def load_tool_definitions(file_path: str):
-    try:
-        # 파일을 'utf-8' 인코딩으로 명시적으로 읽도록 수정
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    except FileNotFoundError:
-        logging.error(f"Error: The file '{file_path}' was not found.")
-        raise HTTPException(status_code=404, detail="Tools file not found.")
-
-
-tools_config = load_tool_definitions("tools.yaml")
+# Load and validate the tool definitions from the tools.yaml file once
+tools_config = get_registry().config
 
 # A simple in-memory session store (replace with a real DB for persistence)
 session_store: Dict[str, Dict] = {}
@@ -36,6 +51,29 @@ class ToolCallRequest(BaseModel):
     session_id: str
     user_id: str
 
+async def send_tool_request(http_method: str, tool_url: str, params: Dict[str, Any], timeout: float):
+    """
+    Send a tool request on the shared client.
+
+    GET requests are idempotent, so connection errors, timeouts and 5xx responses
+    are retried with exponential backoff. POST requests are sent once.
+    """
+    if http_method == "POST":
+        return await http_client.post(tool_url, json=params, timeout=timeout)
+
+    attempt = 0
+    while True:
+        try:
+            response = await http_client.get(tool_url, params=params, timeout=timeout)
+            if response.status_code < 500 or attempt >= TOOL_GET_RETRIES:
+                return response
+        except httpx.TransportError as e:
+            if attempt >= TOOL_GET_RETRIES:
+                raise
+            logging.warning(f"GET {tool_url} failed ({e}), retrying.")
+        await asyncio.sleep(TOOL_RETRY_BACKOFF * (2 ** attempt))
+        attempt += 1
+
 @app.post("/call")
 async def handle_tool_call(request_data: ToolCallRequest):
     """
@@ -66,17 +104,15 @@ async def handle_tool_call(request_data: ToolCallRequest):
             params['user_id'] = user_id
 
         # Route the request to the external API based on the HTTP method
-        if http_method == "GET":
-            response = requests.get(tool_url, params=params)
-        elif http_method == "POST":
-            response = requests.post(tool_url, json=params)
-        else:
+        if http_method not in ("GET", "POST"):
             raise HTTPException(status_code=405, detail=f"HTTP method '{http_method}' not supported.")
+        timeout = float(tool_definition.get("timeout", TOOL_DEFAULT_TIMEOUT))
+        response = await send_tool_request(http_method, tool_url, params, timeout)
 
         response.raise_for_status()
         return response.json()
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logging.error(f"Error calling tool '{tool_name}': {e}")
         raise HTTPException(status_code=500, detail=f"Failed to call external tool: {e}")
 
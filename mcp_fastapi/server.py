@@ -1,30 +1,98 @@
 # server.py
 
 from fastapi import FastAPI, HTTPException
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import asyncpg
+from contextlib import asynccontextmanager
+from datetime import date
 from pydantic import BaseModel
 from typing import Optional
 import os
+import time
+import asyncio
 import logging
+from hotel_search import HotelSearch
 
 logging.basicConfig(level=logging.INFO)
 
+# Connection pool sizing
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', '2'))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', '10'))
+DB_POOL_ACQUIRE_TIMEOUT = float(os.environ.get('DB_POOL_ACQUIRE_TIMEOUT', '10'))
+DB_COMMAND_TIMEOUT = float(os.environ.get('DB_COMMAND_TIMEOUT', '30'))
+
+class PoolStats:
+    """Counts how long requests wait for a pooled connection."""
+
+    def __init__(self):
+        self.acquired = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait):
+        self.acquired += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+pool: Optional[asyncpg.Pool] = None
+pool_stats = PoolStats()
+hotel_search = HotelSearch()
+
+async def init_connection(conn):
+    # Return BIT columns (e.g. hotels.booked) as '0'/'1' strings, as psycopg2 did
+    await conn.set_type_codec('bit', encoder=str, decoder=str, schema='pg_catalog', format='text')
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global pool
+    DATABASE_URL = os.environ.get('DATABASE_URL')
+    pool = await asyncpg.create_pool(
+        DATABASE_URL,
+        min_size=DB_POOL_MIN_SIZE,
+        max_size=DB_POOL_MAX_SIZE,
+        command_timeout=DB_COMMAND_TIMEOUT,
+        init=init_connection
+    )
+    logging.info(f"Database pool created (min_size={DB_POOL_MIN_SIZE}, max_size={DB_POOL_MAX_SIZE}).")
+    async with pool.acquire() as conn:
+        await hotel_search.setup(conn)
+    try:
+        yield
+    finally:
+        await pool.close()
+
 app = FastAPI(
     title="Hotel Agent API",
     description="API for managing hotel searches, bookings, and cancellations.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-def get_db_connection():
-
+@asynccontextmanager
+async def get_db_connection():
+    """Borrow a connection from the shared pool, recording how long the request waited."""
+    start = time.perf_counter()
+    pool_stats.waiting += 1
     try:
-        DATABASE_URL = os.environ.get('DATABASE_URL')
-        conn = psycopg2.connect(DATABASE_URL)
-        return conn
+        conn = await pool.acquire(timeout=DB_POOL_ACQUIRE_TIMEOUT)
+    except asyncio.TimeoutError:
+        # Only waits that ran out count towards pool saturation
+        pool_stats.timeouts += 1
+        logging.error(f"Timed out after {DB_POOL_ACQUIRE_TIMEOUT}s waiting for a database connection")
+        raise HTTPException(status_code=503, detail="Database connection pool exhausted")
     except Exception as e:
+        pool_stats.errors += 1
         logging.error(f"Database connection failed: {e}")
-        raise HTTPException(status_code=500, detail="Database connection failed")
+        raise HTTPException(status_code=503, detail="Database connection failed")
+    finally:
+        pool_stats.waiting -= 1
+    pool_stats.record(time.perf_counter() - start)
+    try:
+        yield conn
+    finally:
+        await pool.release(conn)
 
 # Define Pydantic models for request bodies
 class HotelID(BaseModel):
@@ -39,137 +107,118 @@ class HotelBooking(BaseModel):
     
 # ✨ New API Endpoint: Root URL
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Welcome to the Hotel Agent API. Please use a specific endpoint."}
 
+@app.get("/pool-stats")
+async def get_pool_stats():
+    """
+    Returns connection pool usage and how long requests waited for a connection.
+    """
+    return {
+        "size": pool.get_size(),
+        "idle": pool.get_idle_size(),
+        "min_size": pool.get_min_size(),
+        "max_size": pool.get_max_size(),
+        "acquired": pool_stats.acquired,
+        "waiting": pool_stats.waiting,
+        "timeouts": pool_stats.timeouts,
+        "errors": pool_stats.errors,
+        "avg_wait_ms": round(pool_stats.total_wait / pool_stats.acquired * 1000, 3) if pool_stats.acquired else 0.0,
+        "max_wait_ms": round(pool_stats.max_wait * 1000, 3)
+    }
+
 # The rest of the API endpoints remain unchanged.
 @app.get("/list-all-tables")
-def list_all_tables():
+async def list_all_tables():
     """
     Returns a list of all user-defined tables in the database.
     """
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public'
-                AND table_type = 'BASE TABLE';
-            """)
-            tables = [row['table_name'] for row in cur.fetchall()]
-        return {"tables": tables}
-    finally:
-        conn.close()
+    async with get_db_connection() as conn:
+        rows = await conn.fetch("""
+            SELECT table_name 
+            FROM information_schema.tables 
+            WHERE table_schema = 'public'
+            AND table_type = 'BASE TABLE';
+        """)
+        tables = [row['table_name'] for row in rows]
+    return {"tables": tables}
 
 # The rest of the API endpoints remain unchanged from the previous version.
 @app.get("/get-table-schema")
-def get_table_schema(table_name: str):
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("""
-                SELECT column_name, data_type
-                FROM information_schema.columns
-                WHERE table_name = %s
-                ORDER BY ordinal_position;
-            """, (table_name,))
-            schema = cur.fetchall()
-            if not schema:
-                raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found.")
-        return schema
-    finally:
-        conn.close()
+async def get_table_schema(table_name: str):
+    async with get_db_connection() as conn:
+        schema = await conn.fetch("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_name = $1
+            ORDER BY ordinal_position;
+        """, table_name)
+        if not schema:
+            raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found.")
+    return [dict(row) for row in schema]
 
 @app.get("/get-sample-data")
-def get_sample_data(table_name: str, limit: int = 5):
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(f"SELECT * FROM {table_name} LIMIT %s;", (limit,))
-            data = cur.fetchall()
-            if not data:
-                raise HTTPException(status_code=404, detail=f"No data found in table '{table_name}'.")
-        return data
-    finally:
-        conn.close()
+async def get_sample_data(table_name: str, limit: int = 5):
+    async with get_db_connection() as conn:
+        data = await conn.fetch(f"SELECT * FROM {table_name} LIMIT $1;", limit)
+        if not data:
+            raise HTTPException(status_code=404, detail=f"No data found in table '{table_name}'.")
+    return [dict(row) for row in data]
 
 @app.get("/search-hotels-by-name")
-def search_hotels_by_name(name: str, user_id: str):
+async def search_hotels_by_name(name: str, user_id: str, limit: Optional[int] = None, offset: int = 0):
     logging.info(f"User '{user_id}' is searching for hotels named '{name}'.")
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("SELECT * FROM hotels WHERE name ILIKE %s;", ('%' + name + '%',))
-            hotels = cur.fetchall()
-        return hotels
-    finally:
-        conn.close()
+    async with get_db_connection() as conn:
+        return await hotel_search.search(conn, "name", name, limit, offset)
 
 @app.get("/search-hotels-by-location")
-def search_hotels_by_location(location: str, user_id: str):
+async def search_hotels_by_location(location: str, user_id: str, limit: Optional[int] = None, offset: int = 0):
     logging.info(f"User '{user_id}' is searching for hotels in location '{location}'.")
-    conn = get_db_connection()
-    try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("SELECT * FROM hotels WHERE location ILIKE %s;", ('%' + location + '%',))
-            hotels = cur.fetchall()
-        return hotels
-    finally:
-        conn.close()
+    async with get_db_connection() as conn:
+        return await hotel_search.search(conn, "location", location, limit, offset)
 
 @app.post("/book-hotel")
-def book_hotel(booking: HotelID):
+async def book_hotel(booking: HotelID):
     logging.info(f"User '{booking.user_id}' is booking hotel ID {booking.id}.")
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("UPDATE hotels SET booked = B'1' WHERE id = %s;", (booking.id,))
-            conn.commit()
-            if cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Hotel not found")
-        return {"status": "success", "message": f"Hotel ID {booking.id} booked successfully."}
-    finally:
-        conn.close()
+    async with get_db_connection() as conn:
+        status = await conn.execute("UPDATE hotels SET booked = B'1' WHERE id = $1;", booking.id)
+        if status == "UPDATE 0":
+            raise HTTPException(status_code=404, detail="Hotel not found")
+    return {"status": "success", "message": f"Hotel ID {booking.id} booked successfully."}
 
 @app.post("/cancel-hotel")
-def cancel_hotel(booking: HotelID):
+async def cancel_hotel(booking: HotelID):
     logging.info(f"User '{booking.user_id}' is cancelling hotel ID {booking.id}.")
-    conn = get_db_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute("UPDATE hotels SET booked = B'0' WHERE id = %s;", (booking.id,))
-            conn.commit()
-            if cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Hotel not found")
-        return {"status": "success", "message": f"Hotel ID {booking.id} booking cancelled successfully."}
-    finally:
-        conn.close()
+    async with get_db_connection() as conn:
+        status = await conn.execute("UPDATE hotels SET booked = B'0' WHERE id = $1;", booking.id)
+        if status == "UPDATE 0":
+            raise HTTPException(status_code=404, detail="Hotel not found")
+    return {"status": "success", "message": f"Hotel ID {booking.id} booking cancelled successfully."}
 
 @app.post("/update-hotel")
-def update_hotel(booking: HotelBooking):
+async def update_hotel(booking: HotelBooking):
     logging.info(f"User '{booking.user_id}' is updating dates for hotel ID {booking.id}.")
-    conn = get_db_connection()
+    assignments = []
+    params = []
     try:
-        with conn.cursor() as cur:
-            query = "UPDATE hotels SET "
-            params = []
-            if booking.checkin_date:
-                query += "checkin_date = %s, "
-                params.append(booking.checkin_date)
-            if booking.checkout_date:
-                query += "checkout_date = %s, "
-                params.append(booking.checkout_date)
-            
-            query = query.rstrip(', ')
-            query += " WHERE id = %s;"
-            params.append(booking.id)
-
-            cur.execute(query, tuple(params))
-            conn.commit()
-            if cur.rowcount == 0:
-                raise HTTPException(status_code=404, detail="Hotel not found")
-
-        return {"status": "success", "message": f"Hotel ID {booking.id} updated successfully."}
-    finally:
-        conn.close()
\ No newline at end of file
+        if booking.checkin_date:
+            params.append(date.fromisoformat(booking.checkin_date))
+            assignments.append(f"checkin_date = ${len(params)}")
+        if booking.checkout_date:
+            params.append(date.fromisoformat(booking.checkout_date))
+            assignments.append(f"checkout_date = ${len(params)}")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be in YYYY-MM-DD format")
+    if not assignments:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+
+    params.append(booking.id)
+    query = f"UPDATE hotels SET {', '.join(assignments)} WHERE id = ${len(params)};"
+
+    async with get_db_connection() as conn:
+        status = await conn.execute(query, *params)
+        if status == "UPDATE 0":
+            raise HTTPException(status_code=404, detail="Hotel not found")
+
+    return {"status": "success", "message": f"Hotel ID {booking.id} updated successfully."}
@@ -0,0 +1,195 @@
+# session_buffer.py
+
+import asyncio
+import copy
+import json
+import logging
+import os
+
+SESSION_FLUSH_INTERVAL = float(os.environ.get('SESSION_FLUSH_INTERVAL', '1.0'))
+SESSION_FLUSH_THRESHOLD = int(os.environ.get('SESSION_FLUSH_THRESHOLD', '50'))
+
+# Batched writes: one statement per kind of change, whatever the number of sessions.
+# Values are passed as JSON text so lists are not mistaken for nested arrays.
+REPLACE_STATES_SQL = """
+    UPDATE sessions AS s
+    SET state = v.state::jsonb, updated_at = CURRENT_TIMESTAMP
+    FROM unnest($1::text[], $2::text[]) AS v(key, state)
+    WHERE s.{key_column} = v.key;
+"""
+APPEND_HISTORY_SQL = """
+    UPDATE sessions AS s
+    SET state = jsonb_set(
+            coalesce(s.state, '{{}}'::jsonb), '{{history}}',
+            coalesce(s.state->'history', '[]'::jsonb) || v.turns::jsonb
+        ),
+        updated_at = CURRENT_TIMESTAMP
+    FROM unnest($1::text[], $2::text[]) AS v(key, turns)
+    WHERE s.{key_column} = v.key;
+"""
+
+class PendingWrite:
+    """Coalesced changes for one session: an optional full state followed by appended turns."""
+
+    def __init__(self):
+        self.state = None
+        self.turns = []
+
+    def replace(self, state):
+        self.state = copy.deepcopy(state)
+        self.turns = []
+
+    def append(self, turns):
+        if self.state is not None:
+            # Fold into the pending full state so the flush is a single write
+            self.state.setdefault('history', []).extend(copy.deepcopy(turns))
+        else:
+            self.turns.extend(copy.deepcopy(turns))
+
+    def merge(self, newer):
+        """Apply a later PendingWrite on top of this one."""
+        if newer.state is not None:
+            self.replace(newer.state)
+        self.append(newer.turns)
+
+    def apply(self, state):
+        """Return `state` with the pending changes applied."""
+        state = copy.deepcopy(self.state) if self.state is not None else copy.deepcopy(state or {})
+        if self.turns:
+            state.setdefault('history', []).extend(copy.deepcopy(self.turns))
+        return state
+
+class BufferedSessionService:
+    """
+    Write-behind layer in front of a RelationalSessionService.
+
+    `update_session_state` and `append_history` only record the change in memory
+    and return immediately. Changes to the same session are coalesced, and all
+    pending sessions are written in one batched UNNEST update per flush. A flush
+    happens every `flush_interval` seconds, as soon as `flush_threshold`
+    sessions are pending, and always on `close()`. Reads go through the buffer,
+    so callers see their own unflushed writes. Sessions are cached after the
+    first read, which assumes one process owns each session at a time.
+    """
+
+    def __init__(self, service, key_column='id', flush_interval=SESSION_FLUSH_INTERVAL,
+                 flush_threshold=SESSION_FLUSH_THRESHOLD):
+        if key_column not in ('id', 'user_id'):
+            raise ValueError(f"Unsupported session key column: {key_column}")
+        self.service = service
+        self.key_column = key_column
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._sessions = {}  # key -> last session read or created
+        self._pending = {}  # key -> PendingWrite
+        self._flush_lock = asyncio.Lock()
+        self._flusher = None
+        self.flushes = 0
+        self.flushed_sessions = 0
+
+    def _ensure_flusher(self):
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._try_flush()
+
+    async def _try_flush(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            logging.error(f"Session flush failed, will retry: {e}")
+
+    def _pending_for(self, key):
+        self._ensure_flusher()
+        pending = self._pending.setdefault(key, PendingWrite())
+        if len(self._pending) >= self.flush_threshold and not self._flush_lock.locked():
+            asyncio.create_task(self._try_flush())
+        return pending
+
+    @staticmethod
+    def _get_state(session):
+        return session['state'] if isinstance(session, dict) else session.state
+
+    @staticmethod
+    def _with_state(session, state):
+        if isinstance(session, dict):
+            return {**session, 'state': state}
+        return session.model_copy(update={'state': state})
+
+    @staticmethod
+    def _session_id(session):
+        return session['id'] if isinstance(session, dict) else session.id
+
+    async def create_session(self, state: dict, app_name: str, user_id: str):
+        session = await self.service.create_session(state=state, app_name=app_name, user_id=user_id)
+        key = user_id if self.key_column == 'user_id' else self._session_id(session)
+        self._sessions[key] = session
+        return session
+
+    async def get_session(self, key: str):
+        session = self._sessions.get(key)
+        if session is None:
+            session = await self.service.get_session(key)
+            self._sessions[key] = session
+        pending = self._pending.get(key)
+        if pending is None:
+            return session
+        return self._with_state(session, pending.apply(self._get_state(session)))
+
+    async def update_session_state(self, key: str, state: dict) -> None:
+        self._pending_for(key).replace(state)
+
+    async def append_history(self, key: str, turns: list) -> None:
+        if turns:
+            self._pending_for(key).append(turns)
+
+    async def flush(self) -> None:
+        """Write all pending changes to the database."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+
+            replaced = {key: write.state for key, write in batch.items() if write.state is not None}
+            appended = {key: write.turns for key, write in batch.items() if write.state is None and write.turns}
+            try:
+                pool = await self.service._get_pool()
+                async with pool.acquire() as conn:
+                    async with conn.transaction():
+                        if replaced:
+                            await conn.execute(
+                                REPLACE_STATES_SQL.format(key_column=self.key_column),
+                                list(replaced), [json.dumps(state) for state in replaced.values()]
+                            )
+                        if appended:
+                            await conn.execute(
+                                APPEND_HISTORY_SQL.format(key_column=self.key_column),
+                                list(appended), [json.dumps(turns) for turns in appended.values()]
+                            )
+            except Exception:
+                # Put the batch back in front of anything written meanwhile
+                for key, newer in self._pending.items():
+                    batch.setdefault(key, PendingWrite()).merge(newer)
+                self._pending = batch
+                raise
+
+            # Keep the in-memory copies in step with what was written
+            for key, write in batch.items():
+                session = self._sessions.get(key)
+                if session is not None:
+                    self._sessions[key] = self._with_state(session, write.apply(self._get_state(session)))
+            self.flushes += 1
+            self.flushed_sessions += len(batch)
+
+    async def close(self) -> None:
+        """Flush everything still pending and close the underlying service."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        try:
+            await self.flush()
+        finally:
+            await self.service.close()
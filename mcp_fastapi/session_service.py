@@ -1,6 +1,7 @@
 # session_service.py
 
-import psycopg2
+import asyncpg
+import asyncio
 import json
 import logging
 from google.adk.sessions import BaseSessionService, Session
@@ -10,19 +11,44 @@ import uuid
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
-class RelationalSessionService(BaseSessionService):
+SESSION_POOL_MIN_SIZE = int(os.environ.get('SESSION_POOL_MIN_SIZE', '1'))
+SESSION_POOL_MAX_SIZE = int(os.environ.get('SESSION_POOL_MAX_SIZE', '5'))
+
+async def _init_connection(conn):
+    # Exchange JSONB values as Python objects instead of JSON strings
+    await conn.set_type_codec('jsonb', encoder=json.dumps, decoder=json.loads, schema='pg_catalog')
+
+class PooledSessionStore:
+    """
+    Lazily created asyncpg pool for the sessions table.
+
+    The lock makes sure concurrent first calls share one pool instead of each
+    creating their own. Subclasses add the session queries on top.
+    """
     def __init__(self, db_url: str):
         self.db_url = db_url
-        self._ensure_table_exists()
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
 
-    def _get_conn(self):
-        return psycopg2.connect(self.db_url)
+    async def _get_pool(self):
+        """Create the connection pool and the sessions table on first use."""
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    pool = await asyncpg.create_pool(
+                        self.db_url,
+                        min_size=SESSION_POOL_MIN_SIZE,
+                        max_size=SESSION_POOL_MAX_SIZE,
+                        init=_init_connection
+                    )
+                    await self._ensure_table_exists(pool)
+                    self._pool = pool
+        return self._pool
 
-    def _ensure_table_exists(self):
-        conn = self._get_conn()
+    async def _ensure_table_exists(self, pool):
         try:
-            with conn.cursor() as cur:
-                cur.execute("""
+            async with pool.acquire() as conn:
+                await conn.execute("""
                     CREATE TABLE IF NOT EXISTS sessions (
                         id VARCHAR(36) PRIMARY KEY,
                         app_name TEXT NOT NULL,
@@ -33,62 +59,78 @@ class RelationalSessionService(BaseSessionService):
                     );
                     CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions (user_id);
                 """)
-                conn.commit()
             logging.info("Sessions table checked/created successfully.")
         except Exception as e:
             logging.error(f"Error creating sessions table: {e}")
-            conn.rollback()
-        finally:
-            conn.close()
 
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+class RelationalSessionService(PooledSessionStore, BaseSessionService):
     async def create_session(self, state: dict, app_name: str, user_id: str) -> Session:
         session_id = str(uuid.uuid4())
-        conn = self._get_conn()
+        pool = await self._get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "INSERT INTO sessions (id, app_name, user_id, state) VALUES (%s, %s, %s, %s);",
-                    (session_id, app_name, user_id, json.dumps(state))
-                )
-                conn.commit()
+            await pool.execute(
+                "INSERT INTO sessions (id, app_name, user_id, state) VALUES ($1, $2, $3, $4);",
+                session_id, app_name, user_id, state
+            )
             return Session(id=session_id, app_name=app_name, user_id=user_id, state=state)
         except Exception as e:
             logging.error(f"Error creating session: {e}")
-            conn.rollback()
             raise
-        finally:
-            conn.close()
 
     async def get_session(self, session_id: str) -> Session:
-        conn = self._get_conn()
+        pool = await self._get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute("SELECT id, app_name, user_id, state FROM sessions WHERE id = %s;", (session_id,))
-                row = cur.fetchone()
-                if not row:
-                    raise FileNotFoundError(f"Session with ID '{session_id}' not found.")
-                
-                session_id, app_name, user_id, state_json = row
-                state = json.loads(state_json)
-                return Session(id=session_id, app_name=app_name, user_id=user_id, state=state)
+            row = await pool.fetchrow("SELECT id, app_name, user_id, state FROM sessions WHERE id = $1;", session_id)
+            if not row:
+                raise FileNotFoundError(f"Session with ID '{session_id}' not found.")
+
+            return Session(id=row['id'], app_name=row['app_name'], user_id=row['user_id'], state=row['state'] or {})
         except Exception as e:
             logging.error(f"Error getting session: {e}")
             raise
-        finally:
-            conn.close()
 
     async def update_session_state(self, session_id: str, state: dict) -> None:
-        conn = self._get_conn()
+        """Replace the whole session state."""
+        pool = await self._get_pool()
         try:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "UPDATE sessions SET state = %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s;",
-                    (json.dumps(state), session_id)
-                )
-                conn.commit()
+            await pool.execute(
+                "UPDATE sessions SET state = $1, updated_at = CURRENT_TIMESTAMP WHERE id = $2;",
+                state, session_id
+            )
         except Exception as e:
             logging.error(f"Error updating session state: {e}")
-            conn.rollback()
             raise
-        finally:
-            conn.close()
\ No newline at end of file
+
+    async def append_history(self, session_id: str, turns: list) -> None:
+        """
+        Append turns to state['history'] in place.
+
+        Only the new turns are sent; PostgreSQL concatenates them onto the stored
+        array, so the cost does not grow with the length of the conversation.
+        """
+        if not turns:
+            return
+        pool = await self._get_pool()
+        try:
+            await pool.execute(
+                """
+                UPDATE sessions
+                SET state = jsonb_set(
+                        coalesce(state, '{}'::jsonb), '{history}',
+                        coalesce(state->'history', '[]'::jsonb) || $2::jsonb
+                    ),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = $1;
+                """,
+                session_id, turns
+            )
+        except Exception as e:
+            logging.error(f"Error appending session history: {e}")
+            raise
@@ -0,0 +1,47 @@
+# streaming.py
+
+import json
+
+def compact_json(value) -> str:
+    """JSON for prompts and console output: no indentation or padding, non-ASCII kept as is."""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+def starts_like_json(text: str) -> bool:
+    """Whether a model reply looks like a JSON tool call rather than prose."""
+    return text.lstrip()[:1] in ('{', '[', '`')
+
+async def print_stream(response, prefix="[AGENT]: ", hold_json=False) -> str:
+    """
+    Print a streaming Gemini response as its chunks arrive and return the full text.
+
+    `response` is the result of `generate_content_async(..., stream=True)` or
+    `send_message_async(..., stream=True)`. With `hold_json`, a reply that starts
+    like JSON is collected without being printed, so the caller can treat it as
+    a tool call; use `starts_like_json` on the returned text to tell the cases apart.
+    """
+    chunks = []
+    printing = not hold_json
+    started = False
+    async for chunk in response:
+        try:
+            text = chunk.text
+        except ValueError:
+            # Chunks without text parts, e.g. a final chunk that only carries the finish reason
+            continue
+        chunks.append(text)
+        if not printing:
+            collected = "".join(chunks)
+            if not collected.strip() or starts_like_json(collected):
+                continue
+            printing = True
+            text = collected
+        if not started:
+            text = text.lstrip()
+            if not text:
+                continue
+            print(prefix, end="", flush=True)
+            started = True
+        print(text, end="", flush=True)
+    if started:
+        print()
+    return "".join(chunks).strip()
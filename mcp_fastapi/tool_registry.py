@@ -0,0 +1,82 @@
+# tool_registry.py
+
+import logging
+import os
+import yaml
+
+TOOLS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools.yaml')
+
+JSON_SCHEMA_TYPES = {'string', 'integer', 'number', 'boolean', 'object', 'array'}
+HTTP_METHODS = {'GET', 'POST'}
+
+class ToolRegistry:
+    """
+    Tool definitions from tools.yaml, loaded and validated once.
+
+    `prompt()` renders the catalog as a compact, deterministic text block (one
+    line per tool plus one per parameter, required parameters marked with `*`)
+    that agents put in the model's system instruction, so it is built once per process and not re-sent with every
+    user turn.
+    """
+
+    def __init__(self, path: str = TOOLS_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        self.config = config
+        self.toolsets = config.get('toolsets', {})
+        self.tools = {name: definition for name, definition in config.items() if name != 'toolsets'}
+        for name, definition in self.tools.items():
+            self._validate(name, definition)
+        self._prompt = self._render()
+        logging.info(f"Loaded {len(self.tools)} tools from {path}.")
+
+    @staticmethod
+    def _validate(name: str, definition: dict):
+        if not definition.get('url'):
+            raise ValueError(f"Tool '{name}' has no url.")
+        if definition.get('http_method', 'GET').upper() not in HTTP_METHODS:
+            raise ValueError(f"Tool '{name}' uses unsupported HTTP method '{definition.get('http_method')}'.")
+        schema = definition.get('request_schema')
+        if not isinstance(schema, dict) or schema.get('type') != 'object':
+            raise ValueError(f"Tool '{name}' request_schema must be an object schema.")
+        properties = schema.get('properties') or {}
+        if not isinstance(properties, dict):
+            raise ValueError(f"Tool '{name}' request_schema properties must be a mapping.")
+        for param, spec in properties.items():
+            if not isinstance(spec, dict) or spec.get('type') not in JSON_SCHEMA_TYPES:
+                raise ValueError(f"Tool '{name}' parameter '{param}' needs a valid JSON schema type.")
+        for param in schema.get('required') or []:
+            if param not in properties:
+                raise ValueError(f"Tool '{name}' requires unknown parameter '{param}'.")
+
+    def _render(self) -> str:
+        lines = ["Parameters marked * are required."]
+        for name, definition in self.tools.items():
+            lines.append(f"- {name}: {definition.get('description', '').strip()}")
+            properties = definition['request_schema'].get('properties') or {}
+            required = set(definition['request_schema'].get('required') or [])
+            for param, spec in properties.items():
+                kind = spec['type'] + (f", {spec['format']}" if spec.get('format') else '')
+                description = spec.get('description', '').strip()
+                lines.append(f"  - {param}{'*' if param in required else ''} ({kind}){': ' + description if description else ''}")
+        return "\n".join(lines)
+
+    def prompt(self) -> str:
+        """The rendered tool catalog."""
+        return self._prompt
+
+    def get(self, name: str):
+        return self.tools.get(name)
+
+    def http_method(self, name: str) -> str:
+        definition = self.tools.get(name) or {}
+        return definition.get('http_method', 'GET').upper()
+
+_registry = None
+
+def get_registry() -> ToolRegistry:
+    """Process-wide registry, loaded on first use."""
+    global _registry
+    if _registry is None:
+        _registry = ToolRegistry()
+    return _registry
@@ -26,11 +26,22 @@ genai.configure(api_key=GOOGLE_API_KEY)
 def get_gemini_response(prompt_text):
     """
     Gemini 모델을 호출하여 자연어를 SQL로 변환합니다.
+    응답은 스트리밍으로 받아 생성되는 즉시 출력합니다.
     """
     try:
         model = genai.GenerativeModel("gemini-2.0-flash-001")
-        response = model.generate_content(prompt_text)
-        return response.text.strip()
+        response = model.generate_content(prompt_text, stream=True)
+        chunks = []
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # 텍스트가 없는 청크(종료 사유만 담긴 마지막 청크 등)는 건너뜁니다.
+                continue
+            print(text, end="", flush=True)
+            chunks.append(text)
+        print()
+        return "".join(chunks).strip()
     except Exception as e:
         print(f"Error calling Gemini API: {e}")
         return None
@@ -65,12 +76,11 @@ def main():
     사용자 쿼리: "{natural_language_query}"
     """
 
+    print("Generated SQL: ")
     generated_sql = get_gemini_response(prompt)
     if not generated_sql:
         sys.exit(1)
 
-    print(f"Generated SQL: \n{generated_sql}")
-
     try:
         # 데이터베이스 연결 요청
         connect_response = requests.post(
@@ -149,14 +149,15 @@ class AgentCLI:
                     "content": msg.content.text if hasattr(msg.content, 'text') else str(msg.content)
                 })
             
-            # Use the agent with the formatted messages
-            response = await self.agent.run(str(messages))
-            
-            # Access the response content
-            if hasattr(response, 'content'):
-                response_text = response.content
-            else:
-                response_text = str(response)
+            # Stream the agent's answer so the first tokens show up right away
+            print("\n🤖 ", end="", flush=True)
+            chunks = []
+            async with self.agent.run_stream(str(messages)) as response:
+                async for delta in response.stream_text(delta=True):
+                    print(delta, end="", flush=True)
+                    chunks.append(delta)
+            print()
+            response_text = "".join(chunks)
             
             # Extract SQL from response
             sql_query = None
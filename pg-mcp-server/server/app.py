@@ -8,7 +8,7 @@ configure_logging(level=log_level)
 logger = get_logger("app")
 
 # Import MCP instance and other components after logging is configured
-from server.config import mcp, global_db
+from server.config import mcp, global_db, global_cursors
 
 # Import registration functions
 from server.resources.schema import register_schema_resources
@@ -17,6 +17,8 @@ from server.resources.extensions import register_extension_resources
 from server.tools.connection import register_connection_tools
 from server.tools.query import register_query_tools
 from server.tools.viz import register_viz_tools
+from server.tools.stats import register_stats_tools
+from server.tools.schema import register_schema_tools
 from server.prompts.natural_language import register_natural_language_prompts
 from server.prompts.data_visualization import register_data_visualization_prompts
 
@@ -28,6 +30,8 @@ register_data_resources()     # Data-related resources (sample, rowcount, etc.)
 register_connection_tools()   # Connection management tools
 register_query_tools()
 register_viz_tools()         # Visualization tools
+register_stats_tools()        # Cache and cursor statistics
+register_schema_tools()       # Batch table introspection
 register_natural_language_prompts()  # Natural language to SQL prompts
 register_data_visualization_prompts() # Data visualization prompts
 
@@ -42,6 +46,7 @@ async def starlette_lifespan(app):
     logger.info("Starlette application starting up")
     yield
     logger.info("Starlette application shutting down, closing all database connections")
+    await global_cursors.close_all()
     await global_db.close()
 
 if __name__ == "__main__":
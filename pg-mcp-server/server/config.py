@@ -4,33 +4,123 @@ from mcp.server.fastmcp import FastMCP
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
 from server.database import Database
+from server.cursors import CursorManager
+from server.results import ResultCache
+from server.guard import QueryGuard
+from server.resources.cache import SchemaCache
+from server.resources.snapshot import DatabaseSnapshot
+from server.prompts.assembly import PromptAssembler
 from server.logging_config import configure_logging, get_logger
 
 # Initialize logging with our custom configuration
 logger = get_logger("instance")
 
+# Prepared statements kept per pooled connection
+statement_cache_size = int(os.getenv("PG_MCP_STATEMENT_CACHE_SIZE", "256"))
+
+# Default pool policy; individual connections can override it through the connect tool
+pool_policy = {
+    "min_size": int(os.getenv("PG_MCP_POOL_MIN_SIZE", "1")),
+    "max_size": int(os.getenv("PG_MCP_POOL_MAX_SIZE", "10")),
+    "max_queries": int(os.getenv("PG_MCP_POOL_MAX_QUERIES", "50000")),
+    "max_inactive_connection_lifetime": float(os.getenv("PG_MCP_POOL_CONN_IDLE_LIFETIME", "60")),
+    "acquire_timeout": float(os.getenv("PG_MCP_POOL_ACQUIRE_TIMEOUT", "30")),
+    "command_timeout": float(os.getenv("PG_MCP_POOL_COMMAND_TIMEOUT", "60")),
+    "max_idle_time": float(os.getenv("PG_MCP_POOL_MAX_IDLE_TIME", "600"))
+}
+pool_reap_interval = float(os.getenv("PG_MCP_POOL_REAP_INTERVAL", "30"))
+
 # 환경변수에서 DATABASE_URL 가져오기
 database_url = os.getenv("DATABASE_URL")
 if database_url:
     logger.info(f"Using DATABASE_URL from environment: {database_url}")
-    global_db = Database()
+    global_db = Database(
+        statement_cache_size=statement_cache_size,
+        pool_policy=pool_policy,
+        reap_interval=pool_reap_interval
+    )
     # 기본 연결을 미리 등록
     default_conn_id = global_db.register_connection(database_url)
     logger.info(f"Pre-registered default connection with ID: {default_conn_id}")
 else:
     logger.warning("DATABASE_URL not found in environment variables")
-    global_db = Database()
+    global_db = Database(
+        statement_cache_size=statement_cache_size,
+        pool_policy=pool_policy,
+        reap_interval=pool_reap_interval
+    )
 
 logger.info("Global database manager initialized")
 
+# Server-side cursors used by paginated pg_query calls
+global_cursors = CursorManager(
+    global_db,
+    idle_ttl=float(os.getenv("PG_MCP_CURSOR_IDLE_TTL", "300")),
+    max_per_connection=int(os.getenv("PG_MCP_CURSOR_MAX_PER_CONN", "4")),
+    default_page_size=int(os.getenv("PG_MCP_CURSOR_PAGE_SIZE", "500")),
+    max_page_size=int(os.getenv("PG_MCP_CURSOR_MAX_PAGE_SIZE", "5000"))
+)
+
+def _optional_number(name, cast=float):
+    value = os.getenv(name)
+    return cast(value) if value else None
+
+# Budgets for pg_query; unset variables leave the limit disabled
+global_guard = QueryGuard(limits={
+    "statement_timeout": _optional_number("PG_MCP_STATEMENT_TIMEOUT"),
+    "max_rows": _optional_number("PG_MCP_MAX_ROWS", int),
+    "max_cost": _optional_number("PG_MCP_MAX_COST")
+})
+
+# Optional pg_query result cache, disabled unless PG_MCP_RESULT_CACHE_BYTES is set
+global_results = ResultCache(
+    global_db,
+    max_bytes=int(os.getenv("PG_MCP_RESULT_CACHE_BYTES", "0")),
+    ttl=float(os.getenv("PG_MCP_RESULT_CACHE_TTL", "60")),
+    track_tables=os.getenv("PG_MCP_RESULT_CACHE_TRACK_TABLES", "true").lower() in ("1", "true", "yes"),
+    check_interval=float(os.getenv("PG_MCP_RESULT_CACHE_CHECK_INTERVAL", "1"))
+)
+
+# Introspection results for the pgmcp:// schema resources
+global_schema_cache = SchemaCache(
+    global_db,
+    max_entries=int(os.getenv("PG_MCP_SCHEMA_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("PG_MCP_SCHEMA_CACHE_TTL", "600")),
+    check_interval=float(os.getenv("PG_MCP_SCHEMA_CHECK_INTERVAL", "5"))
+)
+
+# Whole-database structure behind pgmcp://{conn_id}/, refreshed per schema
+global_snapshot = DatabaseSnapshot(
+    global_db,
+    max_parallel=int(os.getenv("PG_MCP_SNAPSHOT_PARALLELISM", "4"))
+)
+
+# Pre-rendered natural-language and visualization prompts, per connection and catalog fingerprint.
+# PG_MCP_PROMPT_TOP_K > 0 embeds only the most relevant tables (and their FK neighbors) in each prompt.
+global_prompts = PromptAssembler(
+    global_schema_cache,
+    global_snapshot,
+    top_k=int(os.getenv("PG_MCP_PROMPT_TOP_K", "8")),
+    max_entries=int(os.getenv("PG_MCP_PROMPT_CACHE_SIZE", "256")),
+    schema_format=os.getenv("PG_MCP_PROMPT_SCHEMA_FORMAT", "compact")
+)
+
 @asynccontextmanager
 async def app_lifespan(app: FastMCP) -> AsyncIterator[dict]:
     """Manage application lifecycle."""
-    mcp.state = {"db": global_db}
+    mcp.state = {
+        "db": global_db,
+        "cursors": global_cursors,
+        "results": global_results,
+        "guard": global_guard,
+        "schema_cache": global_schema_cache,
+        "snapshot": global_snapshot,
+        "prompts": global_prompts
+    }
     logger.info("Application startup - using global database manager")
     
     try:
-        yield {"db": global_db}
+        yield mcp.state
     finally:
         # Don't close connections on individual session end
         pass
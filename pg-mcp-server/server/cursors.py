@@ -0,0 +1,190 @@
+# server/cursors.py
+import asyncio
+import time
+import uuid
+from server.logging_config import get_logger
+from server.encoding import encode_records
+
+logger = get_logger("pg-mcp.cursors")
+
+class OpenCursor:
+    """A server-side cursor pinned to one pooled connection inside a read-only transaction."""
+
+    def __init__(self, cursor_id, conn_id, conn, transaction, cursor, format="rows"):
+        self.cursor_id = cursor_id
+        self.conn_id = conn_id
+        self.format = format
+        self.conn = conn
+        self.transaction = transaction
+        self.cursor = cursor
+        self.attributes = None  # Result columns, for the encoding of an empty page
+        self.lookahead = None  # Row read past the end of the previous page
+        self.last_used = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.closed = False
+
+class CursorManager:
+    """
+    Keeps server-side cursors open between tool calls so large results can be
+    paged through with bounded memory.
+
+    Every open cursor holds a pool connection, so cursors are capped per
+    connection ID and closed after ``idle_ttl`` seconds without a fetch.
+    """
+
+    def __init__(self, db, idle_ttl=300.0, max_per_connection=4, default_page_size=500, max_page_size=5000):
+        self._db = db
+        self._cursors = {}  # cursor_id -> OpenCursor
+        self._reaper = None
+        self.idle_ttl = idle_ttl
+        self.max_per_connection = max_per_connection
+        self.default_page_size = default_page_size
+        self.max_page_size = max_page_size
+
+    def _page_size(self, page_size):
+        if not page_size or page_size <= 0:
+            page_size = self.default_page_size
+        return min(page_size, self.max_page_size)
+
+    def count(self, conn_id=None):
+        """Number of open cursors, optionally restricted to one connection ID."""
+        if conn_id is None:
+            return len(self._cursors)
+        return sum(1 for entry in self._cursors.values() if entry.conn_id == conn_id)
+
+    async def open(self, conn_id, query, params=None, page_size=None, format="rows", statement_timeout=None):
+        """
+        Declare a cursor for the query and return its first page.
+        
+        ``statement_timeout`` (seconds) bounds each fetch from the cursor.
+
+        Returns:
+            Page encoded in ``format`` (see ``fetch``)
+        """
+        await self.reap_idle()
+
+        if self.count(conn_id) >= self.max_per_connection:
+            raise ValueError(
+                f"Too many open cursors for connection ID {conn_id} (limit {self.max_per_connection}). "
+                "Fetch the remaining pages or close a cursor with pg_close_cursor."
+            )
+
+        conn = await self._db.acquire(conn_id)
+        transaction = conn.transaction(readonly=True)
+        started = False
+        try:
+            await transaction.start()
+            started = True
+            if statement_timeout:
+                await conn.execute(f"SET LOCAL statement_timeout = {int(statement_timeout * 1000)}")
+            statement = await conn.prepare(query)
+            cursor = await statement.cursor(*(params or []))
+        except Exception as e:
+            logger.error(f"Failed to open cursor on connection ID {conn_id}: {e}")
+            if started:
+                await transaction.rollback()
+            await self._db.release(conn_id, conn)
+            raise
+
+        cursor_id = str(uuid.uuid4())
+        entry = OpenCursor(cursor_id, conn_id, conn, transaction, cursor, format)
+        entry.attributes = statement.get_attributes()
+        self._cursors[cursor_id] = entry
+        logger.info(f"Opened cursor {cursor_id} on connection ID {conn_id}")
+        self._ensure_reaper()
+
+        return await self.fetch(cursor_id, page_size)
+
+    async def fetch(self, cursor_id, page_size=None):
+        """
+        Fetch the next page from an open cursor, closing it once exhausted.
+
+        Returns:
+            Dictionary with ``has_more``, ``cursor_id`` (None once exhausted) and the
+            page: ``rows`` as objects, or the keys produced by the cursor's format
+        """
+        entry = self._cursors.get(cursor_id)
+        if entry is None:
+            raise ValueError(f"Unknown or expired cursor: {cursor_id}")
+
+        page_size = self._page_size(page_size)
+
+        async with entry.lock:
+            if entry.closed:
+                raise ValueError(f"Unknown or expired cursor: {cursor_id}")
+
+            rows = [entry.lookahead] if entry.lookahead is not None else []
+            try:
+                # Read one row beyond the page so we know whether another page exists
+                rows.extend(await entry.cursor.fetch(page_size + 1 - len(rows)))
+            except Exception as e:
+                logger.error(f"Cursor {cursor_id} fetch failed: {e}")
+                await self._close_entry(entry)
+                raise
+
+            has_more = len(rows) > page_size
+            entry.lookahead = rows.pop() if has_more else None
+            entry.last_used = time.monotonic()
+
+            if not has_more:
+                await self._close_entry(entry)
+
+        encoded = encode_records(rows, entry.format, entry.attributes)
+        page = {"rows": encoded} if entry.format == "rows" else encoded
+        page["has_more"] = has_more
+        page["cursor_id"] = cursor_id if has_more else None
+        return page
+
+    async def close(self, cursor_id):
+        """Close an open cursor. Returns False if it was not open."""
+        entry = self._cursors.get(cursor_id)
+        if entry is None:
+            return False
+
+        async with entry.lock:
+            await self._close_entry(entry)
+        return True
+
+    async def close_all(self, conn_id=None):
+        """Close all cursors, or only those belonging to ``conn_id``."""
+        for cursor_id, entry in list(self._cursors.items()):
+            if conn_id is None or entry.conn_id == conn_id:
+                await self.close(cursor_id)
+
+        if conn_id is None and self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+
+    async def reap_idle(self):
+        """Close cursors that have not been fetched from within ``idle_ttl`` seconds."""
+        now = time.monotonic()
+        for cursor_id, entry in list(self._cursors.items()):
+            if now - entry.last_used > self.idle_ttl and not entry.lock.locked():
+                logger.info(f"Closing idle cursor {cursor_id} on connection ID {entry.conn_id}")
+                await self.close(cursor_id)
+
+    async def _close_entry(self, entry):
+        """Tear down a cursor. The caller must hold ``entry.lock``."""
+        if entry.closed:
+            return
+        entry.closed = True
+        self._cursors.pop(entry.cursor_id, None)
+        try:
+            await entry.transaction.rollback()
+        except Exception as e:
+            logger.warning(f"Error rolling back cursor {entry.cursor_id}: {e}")
+        await self._db.release(entry.conn_id, entry.conn)
+        logger.debug(f"Closed cursor {entry.cursor_id}")
+
+    def _ensure_reaper(self):
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_loop())
+
+    async def _reap_loop(self):
+        # Runs only while cursors are open; restarted by the next open()
+        while self._cursors:
+            await asyncio.sleep(min(self.idle_ttl, 30.0))
+            try:
+                await self.reap_idle()
+            except Exception as e:
+                logger.error(f"Cursor reaper error: {e}")
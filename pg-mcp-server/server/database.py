@@ -1,4 +1,6 @@
 # server/database.py
+import asyncio
+import time
 import uuid
 import urllib.parse
 import asyncpg
@@ -7,12 +9,41 @@ from mcp.server.fastmcp.utilities.logging import get_logger
 
 logger = get_logger("pg-mcp.database")
 
+# Pool settings applied to every connection ID unless overridden
+DEFAULT_POOL_POLICY = {
+    "min_size": 1,                  # Connections opened when the pool is created
+    "max_size": 10,                 # Upper bound on connections per pool
+    "max_queries": 50000,           # Queries before a connection is replaced
+    "max_inactive_connection_lifetime": 60.0,  # Seconds before an unused connection is closed
+    "acquire_timeout": 30.0,        # Seconds to wait for a free connection
+    "command_timeout": 60.0,        # Default per-statement timeout in seconds
+    "max_idle_time": 600.0          # Seconds without activity before the whole pool is closed (0 disables)
+}
+
 class Database:
-    def __init__(self):
-        """Initialize the database manager with no default connections."""
+    def __init__(self, statement_cache_size=256, pool_policy=None, reap_interval=30.0):
+        """
+        Initialize the database manager with no default connections.
+        
+        Args:
+            statement_cache_size: Prepared statements kept per pooled connection
+            pool_policy: Overrides for DEFAULT_POOL_POLICY applied to every pool
+            reap_interval: Seconds between checks for idle pools
+        """
         self._pools = {}  # Dictionary to store connection pools by connection ID
         self._connection_map = {}  # Map connection IDs to actual connection strings
         self._reverse_map = {}  # Map connection strings to their IDs
+        self._pool_policies = {}  # Per-connection overrides of the default pool policy
+        self._last_used = {}  # Connection ID -> monotonic time of the last acquire/release
+        self._active = {}  # Connection ID -> number of connections currently checked out
+        self._origins = {}  # Checked-out connection -> pool it was acquired from
+        self._pending = {}  # Connection ID -> task creating its pool, shared by concurrent callers
+        self._reaper = None
+        self.reap_interval = reap_interval
+        self.pools_reaped = 0
+        self.pool_creations_coalesced = 0
+        self.statement_cache_size = statement_cache_size
+        self.default_pool_policy = self._validate_policy({**DEFAULT_POOL_POLICY, **(pool_policy or {})})
 
     def postgres_connection_to_uuid(self, connection_string, namespace=uuid.NAMESPACE_URL):
         """
@@ -81,40 +112,185 @@ class Database:
         logger.info(f"Found connection string: {connection_string}")
         return connection_string
     
+    def _validate_policy(self, policy):
+        unknown = set(policy) - set(DEFAULT_POOL_POLICY)
+        if unknown:
+            raise ValueError(f"Unknown pool policy settings: {', '.join(sorted(unknown))}")
+        return policy
+
+    def set_pool_policy(self, conn_id, **overrides):
+        """
+        Override pool settings for one connection ID.
+        
+        Settings take effect the next time the pool is created, i.e. immediately
+        for a new connection or after the current pool is closed or reaped.
+        
+        Args:
+            conn_id: Connection ID the policy applies to
+            overrides: Any keys of DEFAULT_POOL_POLICY
+        """
+        overrides = {key: value for key, value in overrides.items() if value is not None}
+        self._validate_policy(overrides)
+        self._pool_policies.setdefault(conn_id, {}).update(overrides)
+
+    def get_pool_policy(self, conn_id):
+        """Get the effective pool settings for a connection ID."""
+        return {**self.default_pool_policy, **self._pool_policies.get(conn_id, {})}
+
     async def initialize(self, conn_id):
-        """Initialize a connection pool for the given connection ID."""
+        """
+        Initialize a connection pool for the given connection ID.
+        
+        Concurrent callers for the same connection ID share a single pool
+        creation instead of each opening (and leaking) their own pool.
+        """
         if not conn_id:
             raise ValueError("Connection ID is required")
             
-        if conn_id not in self._pools:
-            # Get the actual connection string
-            logger.info(f"Initializing pool for conn_id: {conn_id}")
-            connection_string = self.get_connection_string(conn_id)
-            logger.info(f"Using connection string: {connection_string}")
-            
-            logger.info(f"Creating new database connection pool for connection ID {conn_id}")
-            self._pools[conn_id] = await asyncpg.create_pool(
-                connection_string,
-                min_size=2,
-                max_size=10,
-                command_timeout=60.0,
-                # Read-only mode
-                server_settings={"default_transaction_read_only": "true"}
-            )
-        
+        if conn_id in self._pools:
+            return self
+
+        task = self._pending.get(conn_id)
+        if task is None:
+            task = asyncio.create_task(self._create_pool(conn_id))
+            self._pending[conn_id] = task
+            task.add_done_callback(lambda _: self._pending.pop(conn_id, None))
+        else:
+            self.pool_creations_coalesced += 1
+            logger.debug(f"Waiting for pool creation already in progress for connection ID {conn_id}")
+
+        # Shielded so one cancelled caller does not abort the creation for the others
+        await asyncio.shield(task)
         return self
+
+    async def _create_pool(self, conn_id):
+        # Get the actual connection string
+        logger.info(f"Initializing pool for conn_id: {conn_id}")
+        connection_string = self.get_connection_string(conn_id)
+        logger.info(f"Using connection string: {connection_string}")
+        
+        policy = self.get_pool_policy(conn_id)
+        logger.info(f"Creating new database connection pool for connection ID {conn_id}")
+        pool = await asyncpg.create_pool(
+            connection_string,
+            min_size=policy["min_size"],
+            max_size=policy["max_size"],
+            max_queries=policy["max_queries"],
+            max_inactive_connection_lifetime=policy["max_inactive_connection_lifetime"],
+            command_timeout=policy["command_timeout"],
+            statement_cache_size=self.statement_cache_size,
+            # The catalog queries are large; keep them cacheable
+            max_cacheable_statement_size=64 * 1024,
+            # Read-only mode. Set at connection startup, so the pool's
+            # RESET ALL on release restores it if a query changed it
+            server_settings={"default_transaction_read_only": "true"}
+        )
+
+        if conn_id in self._pools:
+            # Another pool was installed while we were connecting; don't leak ours
+            logger.warning(f"Discarding duplicate connection pool for connection ID {conn_id}")
+            await pool.close()
+            return
+
+        self._pools[conn_id] = pool
+        self._last_used[conn_id] = time.monotonic()
+        self._ensure_reaper()
     
+    async def _checkout(self, conn_id):
+        """Acquire a pooled connection, tracking activity for the idle reaper."""
+        if not conn_id:
+            raise ValueError("Connection ID is required")
+
+        # Count the checkout before awaiting so the reaper never closes a pool mid-acquire
+        self._active[conn_id] = self._active.get(conn_id, 0) + 1
+        self._last_used[conn_id] = time.monotonic()
+        try:
+            if conn_id not in self._pools:
+                await self.initialize(conn_id)
+            timeout = self.get_pool_policy(conn_id)["acquire_timeout"]
+            pool = self._pools[conn_id]
+            conn = await pool.acquire(timeout=timeout)
+            self._origins[conn] = pool
+            return conn
+        except BaseException:
+            self._active[conn_id] -= 1
+            raise
+
+    async def _checkin(self, conn_id, conn):
+        self._active[conn_id] = max(self._active.get(conn_id, 0) - 1, 0)
+        self._last_used[conn_id] = time.monotonic()
+        # Always hand the connection back to the pool it came from: a closing pool
+        # waits for it, and a pool re-created under the same ID must not receive it
+        pool = self._origins.pop(conn, None)
+        if pool is not None:
+            await pool.release(conn)
+
     @asynccontextmanager
     async def get_connection(self, conn_id):
         """Get a database connection from the pool for the given connection ID."""
-        if not conn_id:
-            raise ValueError("Connection ID is required")
-            
-        if conn_id not in self._pools:
-            await self.initialize(conn_id)
-        
-        async with self._pools[conn_id].acquire() as conn:
+        conn = await self._checkout(conn_id)
+        try:
             yield conn
+        finally:
+            await self._checkin(conn_id, conn)
+
+    async def acquire(self, conn_id):
+        """
+        Acquire a connection that outlives a single ``async with`` block.
+
+        Used for state that spans several tool calls (e.g. server-side cursors).
+        The caller must hand the connection back with ``release``.
+        """
+        return await self._checkout(conn_id)
+
+    async def release(self, conn_id, conn):
+        """Return a connection obtained through ``acquire`` to its pool."""
+        await self._checkin(conn_id, conn)
+
+    async def reap_idle_pools(self):
+        """
+        Close pools with no checked-out connections and no activity within their
+        policy's ``max_idle_time``. They are re-created on next use.
+        """
+        now = time.monotonic()
+        for conn_id in list(self._pools):
+            max_idle_time = self.get_pool_policy(conn_id)["max_idle_time"]
+            if not max_idle_time or self._active.get(conn_id, 0):
+                continue
+            if now - self._last_used.get(conn_id, now) > max_idle_time:
+                logger.info(f"Closing idle connection pool for connection ID {conn_id}")
+                await self.close(conn_id)
+                self.pools_reaped += 1
+
+    def _ensure_reaper(self):
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_loop())
+
+    async def _reap_loop(self):
+        # Runs only while pools exist; restarted by the next initialize()
+        while self._pools:
+            await asyncio.sleep(self.reap_interval)
+            try:
+                await self.reap_idle_pools()
+            except Exception as e:
+                logger.error(f"Pool reaper error: {e}")
+
+    def pool_stats(self):
+        """Return size and activity information for every open pool."""
+        now = time.monotonic()
+        return {
+            "pools_reaped": self.pools_reaped,
+            "pool_creations_coalesced": self.pool_creations_coalesced,
+            "pools": {
+                conn_id: {
+                    "size": pool.get_size(),
+                    "idle_connections": pool.get_idle_size(),
+                    "checked_out": self._active.get(conn_id, 0),
+                    "idle_seconds": round(now - self._last_used.get(conn_id, now), 1)
+                }
+                for conn_id, pool in self._pools.items()
+            }
+        }
     
     async def close(self, conn_id=None):
         """
@@ -125,14 +301,18 @@ class Database:
                     If None, close all connection pools.
         """
         if conn_id:
-            if conn_id in self._pools:
+            # Detach the pool before awaiting so concurrent callers create a fresh one
+            pool = self._pools.pop(conn_id, None)
+            if pool is not None:
                 logger.info(f"Closing database connection pool for connection ID {conn_id}")
-                await self._pools[conn_id].close()
-                del self._pools[conn_id]
+                await pool.close()
         else:
             # Close all connection pools
             logger.info("Closing all database connection pools")
-            for id, pool in list(self._pools.items()):
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+            for id in list(self._pools):
                 logger.info(f"Closing connection pool for ID {id}")
+                pool = self._pools.pop(id)
                 await pool.close()
-                del self._pools[id]
\ No newline at end of file
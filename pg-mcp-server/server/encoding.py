@@ -0,0 +1,93 @@
+# server/encoding.py
+import base64
+from server.logging_config import get_logger
+
+logger = get_logger("pg-mcp.encoding")
+
+OUTPUT_FORMATS = ("rows", "columns", "arrow")
+
+# Arrow types for empty results, by PostgreSQL type name; others become null columns
+ARROW_TYPE_NAMES = {
+    "bool": "bool_", "int2": "int16", "int4": "int32", "int8": "int64",
+    "float4": "float32", "float8": "float64", "text": "string", "varchar": "string",
+    "bpchar": "string", "name": "string", "date": "date32", "bytea": "binary",
+}
+
+def validate_format(format):
+    """Raise ValueError for an unsupported output format."""
+    if format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{format}'. Use one of: {', '.join(OUTPUT_FORMATS)}")
+    return format
+
+def _column_names(records, attributes):
+    if records:
+        return list(records[0].keys())
+    return [attribute.name for attribute in attributes or []]
+
+def records_to_columns(records, attributes=None):
+    """
+    Encode records as one header plus row arrays, without per-row dicts.
+    Empty results take the header from the statement's ``attributes``.
+    """
+    return {
+        "columns": _column_names(records, attributes),
+        "rows": [list(record) for record in records]
+    }
+
+def records_to_arrow(records, attributes=None):
+    """
+    Encode records as a base64 Arrow IPC stream.
+
+    Columns are built straight from the asyncpg records. Values Arrow cannot
+    infer a type for (e.g. UUIDs, ranges) are sent as strings. Empty results
+    keep their columns, typed from the statement's ``attributes`` where possible.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError("The 'arrow' output format requires pyarrow (install the 'arrow' extra)")
+
+    names = _column_names(records, attributes)
+    arrays = []
+    for i, name in enumerate(names):
+        if not records:
+            type_name = ARROW_TYPE_NAMES.get(attributes[i].type.name)
+            arrays.append(pa.array([], type=getattr(pa, type_name)() if type_name else pa.null()))
+            continue
+        values = [record[i] for record in records]
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            logger.debug(f"Falling back to string encoding for column {name}")
+            arrays.append(pa.array([None if value is None else str(value) for value in values], type=pa.string()))
+
+    table = pa.Table.from_arrays(arrays, names=names)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return {
+        "arrow": base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii"),
+        "row_count": len(records)
+    }
+
+def encode_records(records, format="rows", attributes=None):
+    """
+    Encode asyncpg records in the requested output format.
+
+    Args:
+        records: List of asyncpg Record objects
+        format: "rows" (list of dictionaries), "columns" (header plus row arrays)
+                or "arrow" (base64 Arrow IPC stream)
+        attributes: The statement's result attributes (``PreparedStatement.get_attributes()``),
+                    used for the column names of empty results
+
+    Returns:
+        A list of dictionaries for "rows", otherwise a dictionary
+    """
+    validate_format(format)
+    if format == "columns":
+        return records_to_columns(records, attributes)
+    if format == "arrow":
+        return records_to_arrow(records, attributes)
+    return [dict(record) for record in records]
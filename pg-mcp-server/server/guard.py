@@ -0,0 +1,137 @@
+# server/guard.py
+import json
+import re
+from server.logging_config import get_logger
+from server.statements import normalize_sql
+
+logger = get_logger("pg-mcp.guard")
+
+# Limits applied to queries issued through pg_query; None disables a limit
+DEFAULT_QUERY_LIMITS = {
+    "statement_timeout": None,  # Seconds before the query is cancelled (falls back to the pool's command_timeout)
+    "max_rows": None,           # Results are capped at this many rows and flagged as truncated
+    "max_cost": None            # Queries with a higher estimated plan cost are rejected
+}
+
+# Statements that can be wrapped in a row-limiting subquery, after any leading comments
+ROW_QUERY = re.compile(r"^\s*(?:(?:--[^\n]*(?:\n|$)|/\*.*?\*/)\s*)*\(*\s*(?:select|with|values|table)\b", re.IGNORECASE | re.DOTALL)
+
+def is_select(query):
+    """Whether a query returns rows that a LIMIT wrapper can cap (SELECT, WITH, VALUES, TABLE)."""
+    return ROW_QUERY.match(query) is not None
+
+async def explain(conn, query, params=None):
+    """
+    Run EXPLAIN (FORMAT JSON) for a query on an acquired connection.
+
+    Returns:
+        The EXPLAIN records, one row with the JSON plan in "QUERY PLAN"
+    """
+    return await conn.fetch(f"EXPLAIN (FORMAT JSON) {normalize_sql(query)}", *(params or []))
+
+def _tighter(current, requested):
+    if requested is None:
+        return current
+    if current is None:
+        return requested
+    return min(current, requested)
+
+class QueryGuard:
+    """
+    Enforces statement timeout, row and cost budgets on agent queries.
+
+    Limits come from server defaults, optionally tightened per connection ID and
+    again per call. A call can lower a limit but never raise it above the
+    connection's setting. The cost budget is checked against the planner's
+    estimate from a plain EXPLAIN, so the query itself never runs when it is
+    rejected; without one no EXPLAIN is issued. With a row budget, every
+    row-returning query is wrapped in a LIMIT one row above the budget, so the caller can tell a capped result from one that
+    fits exactly, whatever the planner estimated.
+    """
+
+    def __init__(self, limits=None):
+        self.default_limits = self._validate_limits({**DEFAULT_QUERY_LIMITS, **(limits or {})})
+        self._limits = {}  # conn_id -> overrides of the default limits
+        self.rejected = 0
+        self.limited = 0
+        self.truncated = 0
+
+    def _validate_limits(self, limits):
+        unknown = set(limits) - set(DEFAULT_QUERY_LIMITS)
+        if unknown:
+            raise ValueError(f"Unknown query limits: {', '.join(sorted(unknown))}")
+        for name, value in limits.items():
+            if value is not None and value <= 0:
+                raise ValueError(f"Query limit {name} must be positive")
+        return limits
+
+    def set_limits(self, conn_id, **overrides):
+        """Override the default limits for one connection ID."""
+        overrides = {key: value for key, value in overrides.items() if value is not None}
+        self._validate_limits(overrides)
+        self._limits.setdefault(conn_id, {}).update(overrides)
+
+    def discard(self, conn_id):
+        """Forget the limits of a connection ID."""
+        self._limits.pop(conn_id, None)
+
+    def get_limits(self, conn_id, **requested):
+        """
+        Get the effective limits for a call.
+
+        Args:
+            conn_id: Connection ID the query runs against
+            requested: Per-call limits; each only applies if stricter than the connection's
+        """
+        self._validate_limits({key: value for key, value in requested.items() if value is not None})
+        limits = {**self.default_limits, **self._limits.get(conn_id, {})}
+        return {name: _tighter(value, requested.get(name)) for name, value in limits.items()}
+
+    async def check(self, conn, query, params, limits):
+        """
+        Check a query against its row and cost budgets before it runs.
+
+        Args:
+            conn: Acquired connection to plan the query on
+            query: Normalized SQL text
+            params: Query parameters
+            limits: Effective limits from get_limits
+
+        Returns:
+            The SQL to execute, wrapped in ``LIMIT max_rows + 1`` if max_rows is set
+
+        Raises:
+            ValueError: If the estimated cost exceeds max_cost
+        """
+        max_rows, max_cost = limits["max_rows"], limits["max_cost"]
+        if max_rows is None and max_cost is None:
+            return query
+
+        # Only the cost budget needs the plan
+        if max_cost is not None:
+            try:
+                records = await explain(conn, query, params)
+            except Exception as e:
+                # Statements EXPLAIN cannot plan (SHOW, ...) are not wrapped; their fetched
+                # rows are still capped by the caller
+                logger.debug(f"Could not plan query for budget checks: {e}")
+                return query
+            cost = json.loads(records[0][0])[0]["Plan"]["Total Cost"]
+            if cost > max_cost:
+                self.rejected += 1
+                raise ValueError(
+                    f"Query rejected: estimated cost {cost:.0f} exceeds the limit of {max_cost:.0f}. "
+                    "Add filters or a LIMIT, or check the plan with pg_explain."
+                )
+
+        if max_rows is not None and is_select(query):
+            # The extra row only signals truncation; the caller drops it. The newline keeps
+            # a trailing -- comment from swallowing the closing parenthesis.
+            self.limited += 1
+            return f"SELECT * FROM ({query}\n) AS _limited LIMIT {int(max_rows) + 1}"
+
+        return query
+
+    def stats(self):
+        """Return rejection and truncation counters."""
+        return {"rejected": self.rejected, "limited": self.limited, "truncated": self.truncated}
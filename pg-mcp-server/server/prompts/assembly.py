@@ -0,0 +1,177 @@
+# server/prompts/assembly.py
+import importlib.resources
+import json
+import re
+from collections import OrderedDict
+import jinja2
+from server.logging_config import get_logger
+from server.prompts.retrieval import SchemaIndex, prune
+from server.resources.compact import check_format, render_database
+
+logger = get_logger("pg-mcp.prompts.assembly")
+
+TEMPLATE_PACKAGE = 'server.prompts.templates'
+TEMPLATE_SUFFIX = '.md.jinja2'
+
+# Stand-in for per-call variables while pre-rendering; never produced by real input
+SENTINEL = "\x00pgmcp:{}\x00"
+SENTINEL_PATTERN = re.compile("\x00pgmcp:(\\w+)\x00")
+
+# Per-call variables whose text is used to pick the relevant tables
+RETRIEVAL_VARIABLES = ("nl_query", "sql_query")
+
+def _load_template(name):
+    # Packaged templates do not change while the server runs, so compiled
+    # templates are always reported as up to date and never re-read.
+    return importlib.resources.read_text(TEMPLATE_PACKAGE, name), None, lambda: True
+
+template_env = jinja2.Environment(loader=jinja2.FunctionLoader(_load_template))
+
+def warm_templates():
+    """Compile every packaged prompt template and return their names."""
+    names = sorted(
+        entry.name for entry in importlib.resources.files(TEMPLATE_PACKAGE).iterdir()
+        if entry.name.endswith(TEMPLATE_SUFFIX)
+    )
+    for name in names:
+        template_env.get_template(name)
+    return names
+
+class PromptAssembler:
+    """
+    Builds the natural-language and visualization prompts.
+
+    Each template is rendered once per connection and catalog fingerprint, with
+    the database information filled in and every per-call variable replaced by a
+    sentinel. The result is kept as a list of literal segments and variable
+    names, so a prompt request only joins strings. Per-call variables therefore
+    have to appear as plain ``{{ name }}`` expressions; a template that uses them
+    in any other way is detected and rendered in full on every call instead.
+
+    The database information comes straight from the schema cache and snapshot,
+    without a pgmcp:// resource round trip. With ``top_k`` set, only the tables
+    most relevant to the question (plus their foreign-key neighbors) are
+    embedded, chosen by a BM25 index built once per fingerprint; rendered
+    prompts are then keyed by the selected table set as well. At most
+    ``max_entries`` rendered prompts are kept, least recently used first out.
+    ``schema_format`` selects how the structure is embedded: the resource's
+    full JSON or the compact DDL-like text.
+    """
+
+    def __init__(self, schema_cache, snapshot, top_k=0, max_entries=256, schema_format="compact"):
+        self._schema_cache = schema_cache
+        self._snapshot = snapshot
+        self.schema_format = check_format(schema_format)
+        self._databases = {}  # conn_id -> (fingerprint, structure, JSON text, SchemaIndex or None)
+        self._rendered = OrderedDict()  # (template, conn_id, variables, tables) -> (fingerprint, segments or None, database_info)
+        self.top_k = top_k
+        self.max_entries = max_entries
+        self.templates = warm_templates()
+        self.hits = 0
+        self.misses = 0
+        self.full_renders = 0
+        self.pruned = 0
+
+    def _serialize(self, database):
+        if database is None:
+            return "{}" if self.schema_format == "json" else ""
+        return json.dumps(database) if self.schema_format == "json" else render_database(database)
+
+    async def _database(self, conn_id, fingerprint):
+        cached = self._databases.get(conn_id)
+        if cached and cached[0] == fingerprint:
+            return cached
+
+        database = await self._schema_cache.get_or_load(
+            conn_id, ("database",), lambda: self._snapshot.refresh(conn_id)
+        )
+        text = self._serialize(database)
+        index = SchemaIndex(database) if database is not None and self.top_k > 0 else None
+        cached = (fingerprint, database, text, index)
+        self._databases[conn_id] = cached
+        return cached
+
+    async def database_info(self, conn_id, fingerprint=None):
+        """Return the whole-database structure as embedded in prompts."""
+        if fingerprint is None:
+            fingerprint = await self._schema_cache.fingerprint(conn_id)
+        _, _, text, _ = await self._database(conn_id, fingerprint)
+        return text
+
+    def _prerender(self, template_name, database_info, variables):
+        template = template_env.get_template(template_name)
+        rendered = template.render(
+            database_info=database_info,
+            database_format=self._fence(),
+            **{name: SENTINEL.format(name) for name in variables}
+        )
+        segments = SENTINEL_PATTERN.split(rendered)
+        if set(segments[1::2]) != set(variables):
+            logger.warning(f"Template {template_name} does not output all of {variables} verbatim, rendering it per call")
+            return None
+        return segments
+
+    async def render(self, template_name, conn_id, **values):
+        """
+        Return the prompt text for ``template_name`` on a connection.
+
+        Args:
+            template_name: Template file name, e.g. "generate_sql.md.jinja2"
+            conn_id: Connection ID whose database information is embedded
+            **values: Per-call template variables such as nl_query
+        """
+        fingerprint = await self._schema_cache.fingerprint(conn_id)
+        _, database, full_text, index = await self._database(conn_id, fingerprint)
+
+        tables = None
+        if index is not None:
+            question = " ".join(str(values[name]) for name in RETRIEVAL_VARIABLES if values.get(name))
+            tables = index.select(question, self.top_k)
+            if tables is not None:
+                self.pruned += 1
+        key = (template_name, conn_id, tuple(sorted(values)), tables)
+
+        entry = self._rendered.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            self.hits += 1
+            self._rendered.move_to_end(key)
+        else:
+            self.misses += 1
+            database_info = full_text if tables is None else self._serialize(prune(database, tables))
+            entry = (fingerprint, self._prerender(template_name, database_info, key[2]), database_info)
+            self._rendered[key] = entry
+            self._rendered.move_to_end(key)
+            while len(self._rendered) > self.max_entries:
+                self._rendered.popitem(last=False)
+
+        _, segments, database_info = entry
+        if segments is None:
+            self.full_renders += 1
+            return template_env.get_template(template_name).render(
+                database_info=database_info, database_format=self._fence(), **values
+            )
+        return "".join(
+            segment if i % 2 == 0 else str(values[segment])
+            for i, segment in enumerate(segments)
+        )
+
+    def _fence(self):
+        # Code fence language for the embedded structure
+        return "json" if self.schema_format == "json" else "sql"
+
+    def discard(self, conn_id):
+        """Forget the rendered prompts for a connection."""
+        self._databases.pop(conn_id, None)
+        for key in [key for key in self._rendered if key[1] == conn_id]:
+            del self._rendered[key]
+
+    def stats(self):
+        """Return prompt cache counters."""
+        return {
+            "templates": len(self.templates),
+            "rendered": len(self._rendered),
+            "hits": self.hits,
+            "misses": self.misses,
+            "full_renders": self.full_renders,
+            "pruned": self.pruned
+        }
@@ -1,6 +1,4 @@
 # server/prompts/data_visualization.py
-import importlib.resources
-import jinja2
 from server.config import mcp
 from server.logging_config import get_logger
 from mcp.server.fastmcp.prompts import base
@@ -8,13 +6,6 @@ from server.tools.viz import get_query_metadata
 
 logger = get_logger("pg-mcp.prompts.data_visualization")
 
-# Set up Jinja2 template environment using importlib.resources
-template_env = jinja2.Environment(
-    loader=jinja2.FunctionLoader(lambda name: 
-        importlib.resources.read_text('server.prompts.templates', name)
-    )
-)
-
 def register_data_visualization_prompts():
     """Register data visualization prompts with the MCP server."""
     logger.debug("Registering data visualization prompts")
@@ -38,16 +29,9 @@ def register_data_visualization_prompts():
         query_metadata = await get_query_metadata(conn_id, sql_query)
         logger.debug(f"Query metadata generated successfully")
         
-        # Get database information for context
-        database_resource = f"pgmcp://{conn_id}/"
-        database_response = await mcp.read_resource(database_resource)
-        
-        database_info = database_response[0].content if database_response else "{}"
-        
-        # Render the prompt template
-        prompt_template = template_env.get_template("generate_vega.md.jinja2")
-        prompt_text = prompt_template.render(
-            database_info=database_info,
+        # Database information is pre-rendered into the template; only per-call values are filled in
+        prompt_text = await mcp.state["prompts"].render(
+            "generate_vega.md.jinja2", conn_id,
             nl_query=nl_query,
             sql_query=sql_query,
             query_metadata=query_metadata
@@ -1,19 +1,10 @@
 # server/prompts/natural_language.py
-import importlib.resources
-import jinja2
 from server.config import mcp
 from server.logging_config import get_logger
 from mcp.server.fastmcp.prompts import base
 
 logger = get_logger("pg-mcp.prompts.natural_language")
 
-# Set up Jinja2 template environment using importlib.resources
-template_env = jinja2.Environment(
-    loader=jinja2.FunctionLoader(lambda name: 
-        importlib.resources.read_text('server.prompts.templates', name)
-    )
-)
-
 def register_natural_language_prompts():
     """Register prompts with the MCP server."""
     logger.debug("Registering natural language to SQL prompts")
@@ -27,18 +18,8 @@ def register_natural_language_prompts():
             conn_id: The connection ID for the database
             nl_query: The natural language query to convert to SQL
         """
-        # Get database information
-        database_resource = f"pgmcp://{conn_id}/"
-        database_response = await mcp.read_resource(database_resource)
-        
-        database_info = database_response[0].content if database_response else "{}"
-        
-        # Render the prompt template
-        prompt_template = template_env.get_template("generate_sql.md.jinja2")
-        prompt_text = prompt_template.render(
-            database_info=database_info,
-            nl_query=nl_query
-        )
+        # Database information is pre-rendered into the template; only the query is filled in
+        prompt_text = await mcp.state["prompts"].render("generate_sql.md.jinja2", conn_id, nl_query=nl_query)
         
         return [base.UserMessage(prompt_text)]
     
@@ -53,18 +34,8 @@ def register_natural_language_prompts():
             conn_id: The connection ID for the database
             nl_query: The natural language query to validate
         """
-       # Get database information
-        database_resource = f"pgmcp://{conn_id}/"
-        database_response = await mcp.read_resource(database_resource)
-        
-        database_info = database_response[0].content if database_response else "{}"
-        
-        # Render the prompt template
-        prompt_template = template_env.get_template("validate_nl.md.jinja2")
-        prompt_text = prompt_template.render(
-            database_info=database_info,
-            nl_query=nl_query
-        )
+        # Database information is pre-rendered into the template; only the query is filled in
+        prompt_text = await mcp.state["prompts"].render("validate_nl.md.jinja2", conn_id, nl_query=nl_query)
         
         return [base.UserMessage(prompt_text)]
     
@@ -79,18 +50,7 @@ def register_natural_language_prompts():
             nl_query: The original natural language query
             sql_query: The SQL query to evaluate and explain
         """
-        # Get database information
-        database_resource = f"pgmcp://{conn_id}/"
-        database_response = await mcp.read_resource(database_resource)
-        
-        database_info = database_response[0].content if database_response else "{}"
-        
-        # Render the prompt template
-        prompt_template = template_env.get_template("justify_sql.md.jinja2")
-        prompt_text = prompt_template.render(
-            database_info=database_info,
-            nl_query=nl_query,
-            sql_query=sql_query
-        )
+        # Database information is pre-rendered into the template; only per-call values are filled in
+        prompt_text = await mcp.state["prompts"].render("justify_sql.md.jinja2", conn_id, nl_query=nl_query, sql_query=sql_query)
         
         return [base.UserMessage(prompt_text)]
\ No newline at end of file
@@ -0,0 +1,108 @@
+# server/prompts/retrieval.py
+import math
+import re
+from collections import Counter
+
+# Table names count more than column names or comments when ranking
+TABLE_NAME_WEIGHT = 3
+
+WORD_PATTERN = re.compile(r"[^\W_]+")
+CAMEL_CASE_PATTERN = re.compile(r"([a-z0-9])([A-Z])")
+
+def tokenize(text):
+    """Split identifiers and prose into lower-case terms, folding simple English plurals."""
+    if not text:
+        return []
+    terms = []
+    for word in WORD_PATTERN.findall(CAMEL_CASE_PATTERN.sub(r"\1 \2", str(text))):
+        word = word.lower()
+        if len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+class SchemaIndex:
+    """
+    BM25 index over the tables of a whole-database structure (the pgmcp://{conn_id}/ document).
+
+    Each table is indexed by its schema and table name, column names and the table
+    and column comments. ``select`` returns the best matching tables together with
+    the tables they reference or are referenced by, so join paths stay intact.
+    """
+
+    def __init__(self, database, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.tables = []  # (schema, table) in index order
+        self._terms = []  # Counter of terms per table
+        self._neighbors = {}  # (schema, table) -> set of tables linked by a foreign key
+
+        for schema in database.get("schemas", []):
+            for table in schema.get("tables") or []:
+                key = (schema["name"], table["name"])
+                terms = tokenize(schema["name"]) + tokenize(table["name"]) * TABLE_NAME_WEIGHT
+                terms += tokenize(table.get("description"))
+                for column in table.get("columns") or []:
+                    terms += tokenize(column["name"]) + tokenize(column.get("description"))
+                self.tables.append(key)
+                self._terms.append(Counter(terms))
+
+                for fk in table.get("foreign_keys") or []:
+                    referenced = (fk.get("referenced_schema") or schema["name"], fk["referenced_table"])
+                    self._neighbors.setdefault(key, set()).add(referenced)
+                    self._neighbors.setdefault(referenced, set()).add(key)
+
+        lengths = [sum(terms.values()) for terms in self._terms]
+        self._lengths = lengths
+        self._average_length = sum(lengths) / len(lengths) if lengths else 0
+        document_frequency = Counter(term for terms in self._terms for term in terms)
+        count = len(self.tables)
+        self._idf = {
+            term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequency.items()
+        }
+
+    def search(self, text, k):
+        """Return up to ``k`` (schema, table) keys with a positive score, best first."""
+        query = set(tokenize(text)) & self._idf.keys()
+        if not query:
+            return []
+        scores = []
+        for key, terms, length in zip(self.tables, self._terms, self._lengths):
+            score = 0.0
+            for term in query:
+                frequency = terms.get(term)
+                if frequency:
+                    norm = self.k1 * (1 - self.b + self.b * length / self._average_length)
+                    score += self._idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            if score > 0:
+                scores.append((score, key))
+        scores.sort(key=lambda item: (-item[0], item[1]))
+        return [key for _, key in scores[:k]]
+
+    def select(self, text, k):
+        """
+        Return the set of tables to show for ``text``: the top ``k`` matches plus
+        their foreign-key neighbors. Returns None when the whole structure should be
+        used instead, i.e. when it has no more than ``k`` tables or nothing matched.
+        """
+        if len(self.tables) <= k:
+            return None
+        matches = self.search(text, k)
+        if not matches:
+            return None
+        selected = set(matches)
+        for key in matches:
+            selected |= self._neighbors.get(key, set())
+        return frozenset(selected)
+
+def prune(database, selected):
+    """Return a copy of the structure that only contains the ``selected`` tables."""
+    schemas = []
+    for schema in database.get("schemas", []):
+        tables = [table for table in schema.get("tables") or [] if (schema["name"], table["name"]) in selected]
+        if tables:
+            schemas.append({**schema, "tables": tables})
+    return {**database, "schemas": schemas}
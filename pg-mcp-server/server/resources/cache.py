@@ -0,0 +1,114 @@
+# server/resources/cache.py
+import asyncio
+import importlib.resources
+import time
+from collections import OrderedDict
+from server.logging_config import get_logger
+
+logger = get_logger("pg-mcp.resources.cache")
+
+FINGERPRINT_SQL = importlib.resources.read_text('server.resources.sql', 'catalog_fingerprint.sql')
+
+class SchemaCache:
+    """
+    In-process cache for catalog introspection results, keyed by connection ID.
+
+    Entries are tagged with the catalog fingerprint they were loaded under and are
+    dropped as soon as the fingerprint changes. The fingerprint itself is re-read at
+    most every ``check_interval`` seconds, so repeated reads in between never touch
+    pg_catalog. Entries also expire after ``ttl`` seconds and the least recently used
+    ones are evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, db, max_entries=256, ttl=600.0, check_interval=5.0):
+        self._db = db
+        self._entries = OrderedDict()  # (conn_id, key) -> (value, fingerprint, stored_at)
+        self._fingerprints = {}  # conn_id -> (fingerprint, checked_at)
+        self._locks = {}  # conn_id -> asyncio.Lock serializing fingerprint checks
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def fingerprint(self, conn_id):
+        """Return the catalog fingerprint for a connection, invalidating stale entries."""
+        cached = self._fingerprints.get(conn_id)
+        if cached and time.monotonic() - cached[1] < self.check_interval:
+            return cached[0]
+
+        lock = self._locks.setdefault(conn_id, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed it while we waited
+            cached = self._fingerprints.get(conn_id)
+            if cached and time.monotonic() - cached[1] < self.check_interval:
+                return cached[0]
+
+            async with self._db.get_connection(conn_id) as conn:
+                fingerprint = await conn.fetchval(FINGERPRINT_SQL)
+
+            if cached and cached[0] != fingerprint:
+                logger.info(f"Catalog changed for connection ID {conn_id}, invalidating cached schema data")
+                self.invalidate(conn_id, keep_fingerprint=True)
+            self._fingerprints[conn_id] = (fingerprint, time.monotonic())
+            return fingerprint
+
+    async def get_or_load(self, conn_id, key, loader):
+        """
+        Return the cached value for ``key`` or await ``loader()`` and cache its result.
+        
+        Args:
+            conn_id: Connection ID the value belongs to
+            key: Hashable key identifying the introspection result
+            loader: Coroutine function producing the value on a miss
+        """
+        fingerprint = await self.fingerprint(conn_id)
+        cache_key = (conn_id, key)
+
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            value, entry_fingerprint, stored_at = entry
+            if entry_fingerprint == fingerprint and time.monotonic() - stored_at < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(cache_key)
+                return value
+            del self._entries[cache_key]
+
+        self.misses += 1
+        value = await loader()
+        self._entries[cache_key] = (value, fingerprint, time.monotonic())
+        self._entries.move_to_end(cache_key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+        return value
+
+    def invalidate(self, conn_id=None, keep_fingerprint=False):
+        """Drop cached entries for one connection ID, or for all connections."""
+        for cache_key in list(self._entries):
+            if conn_id is None or cache_key[0] == conn_id:
+                del self._entries[cache_key]
+                self.invalidations += 1
+
+        if not keep_fingerprint:
+            if conn_id is None:
+                self._fingerprints.clear()
+            else:
+                self._fingerprints.pop(conn_id, None)
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
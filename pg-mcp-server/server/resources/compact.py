@@ -0,0 +1,163 @@
+# server/resources/compact.py
+# Compact, DDL-like text rendering of the introspection documents, one line per table:
+#
+#   orders(id int pk, customer_id int fk->shop.customers.id, total numeric) -- ~1000 rows; index (customer_id, placed)
+#
+# Storage details, sizes, defaults and statistics are left out; column types, keys,
+# foreign-key targets, nullability, comments and index columns are kept.
+
+FORMATS = ("json", "compact")
+
+# Shorter spellings PostgreSQL accepts for the most common type names
+TYPE_ALIASES = {
+    "integer": "int",
+    "smallint": "int2",
+    "bigint": "int8",
+    "boolean": "bool",
+    "double precision": "float8",
+    "real": "float4",
+    "character varying": "varchar",
+    "character": "char",
+    "timestamp with time zone": "timestamptz",
+    "timestamp without time zone": "timestamp",
+    "time with time zone": "timetz",
+    "time without time zone": "time",
+}
+
+def check_format(format):
+    """Validate a ``format`` selector value."""
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported format '{format}', expected one of: {', '.join(FORMATS)}")
+    return format
+
+def compact_type(type_name):
+    base, paren, rest = type_name.partition("(")
+    array = ""
+    if rest.endswith("[]"):
+        rest, array = rest[:-2], "[]"
+    elif base.endswith("[]"):
+        base, array = base[:-2], "[]"
+    return TYPE_ALIASES.get(base.strip(), base.strip()) + (paren + rest if paren else "") + array
+
+def _comment(text):
+    return " ".join(str(text).split())
+
+def render_table(schema_name, table):
+    """Render one table from the whole-database structure (pgmcp://{conn_id}/)."""
+    references = {}
+    composite_keys = []
+    for fk in table.get("foreign_keys") or []:
+        target_schema = fk.get("referenced_schema") or schema_name
+        if len(fk["columns"]) == 1:
+            references[fk["columns"][0]] = f"{target_schema}.{fk['referenced_table']}.{fk['referenced_columns'][0]}"
+        else:
+            composite_keys.append(
+                f"fk ({', '.join(fk['columns'])})->{target_schema}.{fk['referenced_table']}"
+                f"({', '.join(fk['referenced_columns'])})"
+            )
+
+    parts = []
+    for column in table.get("columns") or []:
+        constraints = column.get("constraints") or []
+        words = [column["name"], compact_type(column["type"])]
+        if "PRIMARY KEY" in constraints:
+            words.append("pk")
+        else:
+            if not column.get("nullable", True):
+                words.append("not null")
+            if "UNIQUE" in constraints:
+                words.append("unique")
+        if column["name"] in references:
+            words.append(f"fk->{references[column['name']]}")
+        if column.get("description"):
+            words.append(f"/* {_comment(column['description'])} */")
+        parts.append(" ".join(words))
+    # Multi-column keys only hold for the combination, so they are listed at table level
+    if table.get("primary_key"):
+        parts.append(f"pk ({', '.join(table['primary_key'])})")
+    parts.extend(composite_keys)
+    parts.extend(f"unique ({', '.join(columns)})" for columns in table.get("unique_constraints") or [])
+    parts.extend(check["definition"] for check in table.get("check_constraints") or [])
+
+    notes = []
+    if table.get("description"):
+        notes.append(_comment(table["description"]))
+    if table.get("row_count") is not None:
+        notes.append(f"~{table['row_count']} rows")
+    for index in table.get("indexes") or []:
+        if not index.get("is_primary"):
+            kind = "unique index" if index.get("is_unique") else "index"
+            notes.append(f"{kind} ({', '.join(index.get('columns') or [])})")
+
+    line = f"{table['name']}({', '.join(parts)})"
+    return f"{line} -- {'; '.join(notes)}" if notes else line
+
+def _schema_header(schema):
+    header = f"-- schema {schema['name']}"
+    return f"{header}: {_comment(schema['description'])}" if schema.get("description") else header
+
+def render_database(database):
+    """Render the whole-database structure, one block per schema."""
+    blocks = []
+    for schema in (database or {}).get("schemas", []):
+        lines = [_schema_header(schema)]
+        lines.extend(render_table(schema["name"], table) for table in schema.get("tables") or [])
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+def render_schema(schema_info):
+    """Render a schema listing (pgmcp://{conn_id}/schemas/{schema})."""
+    schema = (schema_info or {}).get("schema_info") or {}
+    if not schema:
+        return ""
+    lines = [_schema_header(schema)]
+    for kind, key in (("table", "tables"), ("materialized view", "materialized_views")):
+        for relation in schema.get(key) or []:
+            notes = [_comment(relation["description"])] if relation.get("description") else []
+            if relation.get("row_count") is not None:
+                notes.append(f"~{relation['row_count']} rows")
+            line = f"{kind} {relation['name']}"
+            lines.append(f"{line} -- {'; '.join(notes)}" if notes else line)
+    for extension in schema.get("extensions") or []:
+        lines.append(f"extension {extension.get('name')} {extension.get('version') or ''}".rstrip())
+    return "\n".join(lines)
+
+def render_table_details(schema_name, table_details):
+    """Render a table details document (pgmcp://{conn_id}/schemas/{schema}/tables/{table})."""
+    table = (table_details or {}).get("table") or {}
+    if not table:
+        return ""
+    constraints = table.get("constraints") or {}
+    kinds = {}
+    primary_key = None
+    composite_unique = []
+    for constraint in constraints.get("primary_keys") or []:
+        columns = constraint.get("columns") or []
+        if len(columns) == 1:
+            kinds.setdefault(columns[0], []).append("PRIMARY KEY")
+        else:
+            primary_key = columns
+    for constraint in constraints.get("unique_constraints") or []:
+        columns = constraint.get("columns") or []
+        if len(columns) == 1:
+            kinds.setdefault(columns[0], []).append("UNIQUE")
+        else:
+            composite_unique.append(columns)
+
+    return render_table(schema_name, {
+        "name": table["name"],
+        "description": table.get("description"),
+        "row_count": table.get("row_count"),
+        "columns": [
+            {**column, "constraints": kinds.get(column["name"])}
+            for column in table.get("columns") or []
+        ],
+        "primary_key": primary_key,
+        "foreign_keys": constraints.get("foreign_keys"),
+        "check_constraints": constraints.get("check_constraints"),
+        "unique_constraints": composite_unique,
+        "indexes": [
+            {**index, "columns": index.get("column_expressions") or index.get("column_names")}
+            for index in table.get("indexes") or []
+        ],
+    })
@@ -1,8 +1,11 @@
 # server/resources/schema.py
+import asyncio
 import importlib.resources
+import json
 from server.config import mcp
 from server.logging_config import get_logger
 from server.tools.query import execute_query
+from server.resources.compact import check_format, render_database, render_schema, render_table_details
 
 logger = get_logger("pg-mcp.resources.schemas")
 
@@ -10,72 +13,124 @@ def load_sql_file(filename):
     """Load SQL from a file using importlib.resources."""
     return importlib.resources.read_text('server.resources.sql', filename)
 
+async def fetch_catalog_json(conn_id, filename, column, params=None, default=None):
+    """
+    Run a catalog SQL file and return the JSON document in ``column`` of its first row.
+    Results are served from the schema cache until the catalog changes.
+    """
+    async def load():
+        query = load_sql_file(filename)
+        result = await execute_query(query, conn_id, params)
+        if result and len(result) > 0:
+            return result[0][column]
+        return default
+
+    # List parameters (e.g. table name arrays) become tuples so the key is hashable
+    key = (filename, *(tuple(param) if isinstance(param, list) else param for param in params or []))
+    schema_cache = mcp.state["schema_cache"]
+    return await schema_cache.get_or_load(conn_id, key, load)
+
+def parse_document(value):
+    """Catalog queries return their JSON documents as text; parse them for rendering."""
+    return json.loads(value) if isinstance(value, str) else value
+
+# Independent catalog queries making up the table and materialized view details;
+# each returns one JSON value in its "part" column
+TABLE_PARTS = {
+    "info": "get_schema_table_info.sql",
+    "columns": "get_schema_table_columns.sql",
+    "constraints": "get_schema_table_constraints.sql",
+    "indexes": "get_schema_table_indexes.sql",
+    "statistics": "get_schema_relation_statistics.sql",
+}
+VIEW_PARTS = {
+    "info": "get_schema_view_info.sql",
+    "columns": "get_schema_view_columns.sql",
+    "indexes": "get_schema_view_indexes.sql",
+    "statistics": "get_schema_relation_statistics.sql",
+}
+
+async def fetch_catalog_parts(conn_id, kind, parts, params):
+    """
+    Run independent catalog SQL files concurrently and return their results by part name.
+    Every query runs on its own pooled connection, so a details read takes about as
+    long as its slowest part. The combined result is cached like ``fetch_catalog_json``.
+    """
+    async def load_part(filename):
+        result = await execute_query(load_sql_file(filename), conn_id, params)
+        return parse_document(result[0]["part"]) if result else None
+
+    async def load():
+        values = await asyncio.gather(*(load_part(filename) for filename in parts.values()))
+        return dict(zip(parts, values))
+
+    schema_cache = mcp.state["schema_cache"]
+    return await schema_cache.get_or_load(conn_id, (kind, *params), load)
+
+async def load_table_details(conn_id, schema, table):
+    """Return the table details document ({"table": {...}}), served from the schema cache."""
+    parts = await fetch_catalog_parts(conn_id, "table_details", TABLE_PARTS, [schema, table])
+    return {"table": {
+        **(parts["info"] or {}),
+        "columns": parts["columns"],
+        "constraints": parts["constraints"],
+        "indexes": parts["indexes"],
+        "statistics": parts["statistics"],
+    }}
+
+async def load_view_details(conn_id, schema, view):
+    """Return the materialized view details document ({"materialized_view": {...}})."""
+    parts = await fetch_catalog_parts(conn_id, "view_details", VIEW_PARTS, [schema, view])
+    return {"materialized_view": {
+        **(parts["info"] or {}),
+        "columns": parts["columns"],
+        "indexes": parts["indexes"],
+        "statistics": parts["statistics"],
+    }}
+
+async def load_database(conn_id):
+    """Return the whole-database structure, served from the schema cache."""
+    snapshot = mcp.state["snapshot"]
+    schema_cache = mcp.state["schema_cache"]
+    return await schema_cache.get_or_load(conn_id, ("database",), lambda: snapshot.refresh(conn_id))
+
 def register_schema_resources():
     """Register database schema resources with the MCP server."""
     logger.debug("Registering schema resources")
 
-    # @mcp.resource("pgmcp://{conn_id}/", mime_type="application/json")
-    # async def get_database(conn_id: str):
-    #     """
-    #     Get the complete database information including all schemas, tables, columns, and constraints.
-    #     Returns a comprehensive JSON structure with the entire database structure.
-    #     """
-    #     query = load_sql_file("get_database.sql")
-    #     result = await execute_query(query, conn_id)
-    #     if result and len(result) > 0:
-    #         return result[0]['db_structure']
-    #     return {"schemas": []}
-
     @mcp.resource("pgmcp://{conn_id}/", mime_type="application/json")
     async def get_database(conn_id: str):
-        """Get the complete database information..."""
-        logger.info(f"=== GET_DATABASE called with conn_id: {conn_id}")
-        
-        # 임시로 하드코딩된 스키마 정보 반환
-        return {
-            "schemas": [
-                {
-                    "name": "public",
-                    "tables": [
-                        {
-                            "name": "hotels",
-                            "columns": [
-                                {"name": "id", "type": "integer"},
-                                {"name": "name", "type": "text"},
-                                {"name": "location", "type": "text"}
-                            ]
-                        },
-                        {
-                            "name": "sessions", 
-                            "columns": [
-                                {"name": "id", "type": "integer"},
-                                {"name": "user_id", "type": "integer"},
-                                {"name": "created_at", "type": "timestamp"}
-                            ]
-                        }
-                    ]
-                }
-            ]
-        }
+        """
+        Get the complete database information including all schemas, tables, columns, and constraints.
+        Returns a comprehensive JSON structure with the entire database structure.
+        """
+        return await load_database(conn_id)
+
+    @mcp.resource("pgmcp://{conn_id}/format={format}", mime_type="text/plain")
+    async def get_database_formatted(conn_id: str, format: str):
+        """
+        Get the complete database structure in the given format: "json" (same as
+        pgmcp://{conn_id}/) or "compact", a DDL-like text with one line per table
+        listing column types, keys and foreign-key targets.
+        """
+        database = await load_database(conn_id)
+        return database if check_format(format) == "json" else render_database(database)
 
-    
     @mcp.resource("pgmcp://{conn_id}/schemas", mime_type="application/json")
     async def list_schemas(conn_id: str):
         """Get all non-system schemas in the database."""
-        query = load_sql_file("list_schemas.sql")
-        result = await execute_query(query, conn_id)
-        if result and len(result) > 0:
-            return result[0]['schema_list']
-        return {"schemas": []}
+        return await fetch_catalog_json(conn_id, "list_schemas.sql", "schema_list", default={"schemas": []})
     
     @mcp.resource("pgmcp://{conn_id}/schemas/{schema}", mime_type="application/json")
     async def get_schema(conn_id: str, schema: str):
         """Get information about a particular  schemas in the database. Also provides extension information (if any)"""
-        query = load_sql_file("get_schema.sql")
-        result = await execute_query(query, conn_id, [schema])
-        if result and len(result) > 0:
-            return result[0]['schema_info']
-        return {"schema": []}
+        return await fetch_catalog_json(conn_id, "get_schema.sql", "schema_info", [schema], default={"schema": []})
+
+    @mcp.resource("pgmcp://{conn_id}/schemas/{schema}/format={format}", mime_type="text/plain")
+    async def get_schema_formatted(conn_id: str, schema: str, format: str):
+        """Get schema information in the given format: "json" or the compact text listing."""
+        schema_info = await fetch_catalog_json(conn_id, "get_schema.sql", "schema_info", [schema], default={"schema": []})
+        return schema_info if check_format(format) == "json" else render_schema(parse_document(schema_info))
     
     @mcp.resource("pgmcp://{conn_id}/schemas/{schema}/tables/{table}", mime_type="application/json")
     async def get_schema_table(conn_id: str, schema: str, table: str):
@@ -83,11 +138,16 @@ def register_schema_resources():
         Get comprehensive information about a specific table in a schema.
         This returns detailed information including columns, constraints, indexes, and statistics.
         """
-        query = load_sql_file("get_schema_table.sql")
-        result = await execute_query(query, conn_id, [schema, table])
-        if result and len(result) > 0:
-            return result[0]['table_details']
-        return {"table": {}}
+        return await load_table_details(conn_id, schema, table)
+
+    @mcp.resource("pgmcp://{conn_id}/schemas/{schema}/tables/{table}/format={format}", mime_type="text/plain")
+    async def get_schema_table_formatted(conn_id: str, schema: str, table: str, format: str):
+        """
+        Get table details in the given format: "json" or a single compact DDL-like
+        line with column types, keys, foreign-key targets and indexed columns.
+        """
+        table_details = await load_table_details(conn_id, schema, table)
+        return table_details if check_format(format) == "json" else render_table_details(schema, table_details)
     
     @mcp.resource("pgmcp://{conn_id}/schemas/{schema}/materialized_views/{view}", mime_type="application/json")
     async def get_schema_view(conn_id: str, schema: str, view: str):
@@ -96,8 +156,4 @@ def register_schema_resources():
         This returns detailed information including the view definition SQL, columns, 
         indexes, and statistics.
         """
-        query = load_sql_file("get_schema_view.sql")
-        result = await execute_query(query, conn_id, [schema, view])
-        if result and len(result) > 0:
-            return result[0]['view_details']
-        return {"materialized_view": {}}
\ No newline at end of file
+        return await load_view_details(conn_id, schema, view)
\ No newline at end of file
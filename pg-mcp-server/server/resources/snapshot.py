@@ -0,0 +1,90 @@
+# server/resources/snapshot.py
+import asyncio
+import importlib.resources
+import json
+from server.logging_config import get_logger
+
+logger = get_logger("pg-mcp.resources.snapshot")
+
+SCHEMA_FINGERPRINTS_SQL = importlib.resources.read_text('server.resources.sql', 'schema_fingerprints.sql')
+DATABASE_SCHEMA_SQL = importlib.resources.read_text('server.resources.sql', 'get_database_schema.sql')
+
+class DatabaseSnapshot:
+    """
+    Whole-database structure for the pgmcp://{conn_id}/ resource.
+
+    The structure is assembled one schema at a time, in parallel over the
+    connection pool, and kept in memory between reads. A refresh compares
+    per-schema catalog fingerprints and only re-introspects the schemas that
+    changed, so large databases are not rebuilt from scratch.
+    """
+
+    def __init__(self, db, max_parallel=4):
+        self._db = db
+        self._schemas = {}  # conn_id -> {schema_name: (fingerprint, structure)}
+        self._locks = {}  # conn_id -> asyncio.Lock serializing refreshes
+        self.max_parallel = max_parallel
+        self.schemas_loaded = 0
+        self.schemas_reused = 0
+
+    async def _load_schema(self, conn_id, schema, semaphore):
+        async with semaphore:
+            async with self._db.get_connection(conn_id) as conn:
+                structure = await conn.fetchval(DATABASE_SCHEMA_SQL, schema)
+        return json.loads(structure) if structure else None
+
+    async def refresh(self, conn_id):
+        """
+        Bring the snapshot for a connection up to date and return it.
+
+        Returns:
+            Dictionary with a "schemas" list, one entry per non-system schema
+        """
+        lock = self._locks.setdefault(conn_id, asyncio.Lock())
+        async with lock:
+            async with self._db.get_connection(conn_id) as conn:
+                fingerprints = await conn.fetch(SCHEMA_FINGERPRINTS_SQL)
+
+            cached = self._schemas.get(conn_id, {})
+            changed = [
+                row['schema_name'] for row in fingerprints
+                if row['schema_name'] not in cached or cached[row['schema_name']][0] != row['fingerprint']
+            ]
+
+            if changed:
+                logger.info(f"Refreshing {len(changed)} of {len(fingerprints)} schemas for connection ID {conn_id}")
+            semaphore = asyncio.Semaphore(self.max_parallel)
+            loaded = await asyncio.gather(*(self._load_schema(conn_id, schema, semaphore) for schema in changed))
+            loaded = dict(zip(changed, loaded))
+
+            # Schemas that no longer exist simply drop out of the new mapping
+            schemas = {}
+            for row in fingerprints:
+                name = row['schema_name']
+                if name in loaded:
+                    schemas[name] = (row['fingerprint'], loaded[name])
+                else:
+                    schemas[name] = cached[name]
+            self._schemas[conn_id] = schemas
+            self.schemas_loaded += len(changed)
+            self.schemas_reused += len(fingerprints) - len(changed)
+
+            return {
+                "schemas": [
+                    structure for _, structure in (schemas[name] for name in sorted(schemas))
+                    if structure is not None
+                ]
+            }
+
+    def discard(self, conn_id):
+        """Forget the snapshot for a connection."""
+        self._schemas.pop(conn_id, None)
+
+    def stats(self):
+        """Return snapshot counters."""
+        return {
+            "connections": len(self._schemas),
+            "schemas": sum(len(schemas) for schemas in self._schemas.values()),
+            "schemas_loaded": self.schemas_loaded,
+            "schemas_reused": self.schemas_reused
+        }
@@ -0,0 +1,13 @@
+-- server/resources/sql/catalog_fingerprint.sql
+-- Cheap fingerprint of the system catalogs backing the schema resources
+-- Any DDL on schemas, relations, columns, constraints, comments or extensions
+-- changes at least one component, so cached introspection results can be reused
+-- for as long as the fingerprint stays the same
+SELECT md5(concat_ws('|',
+    (SELECT max(xmin::text::bigint) || '/' || count(*) FROM pg_namespace),
+    (SELECT max(xmin::text::bigint) || '/' || count(*) FROM pg_class),
+    (SELECT max(xmin::text::bigint) || '/' || count(*) FROM pg_attribute),
+    (SELECT max(xmin::text::bigint) || '/' || count(*) FROM pg_constraint),
+    (SELECT max(xmin::text::bigint) || '/' || count(*) FROM pg_description),
+    (SELECT string_agg(extname || '@' || extversion, ',' ORDER BY extname) FROM pg_extension)
+)) AS fingerprint;
@@ -0,0 +1,234 @@
+-- server/resources/sql/get_database_schema.sql
+-- Structure of a single schema for the whole-database resource (pgmcp://{conn_id}/)
+-- Returns tables with columns, foreign keys, indexes and check constraints for schema $1
+-- Single-column primary keys and unique constraints are listed on the column; multi-column
+-- ones only at table level ("primary_key", "unique_constraints"), as they do not make each
+-- column unique on its own
+-- Catalog rows are joined by oid and aggregated once per table, so the cost stays
+-- linear in the size of the schema
+
+WITH
+-- Get the schema itself
+schema_info AS (
+    SELECT
+        n.oid,
+        n.nspname AS schema_name,
+        obj_description(n.oid, 'pg_namespace') AS description
+    FROM
+        pg_namespace n
+    WHERE
+        n.nspname = $1
+),
+
+-- Get all tables in the schema
+tables AS (
+    SELECT
+        t.oid,
+        t.relname AS table_name,
+        obj_description(t.oid, 'pg_class') AS description,
+        pg_stat_get_tuples_inserted(t.oid) AS row_count
+    FROM
+        pg_class t
+    JOIN
+        schema_info s ON t.relnamespace = s.oid
+    WHERE
+        t.relkind = 'r'  -- 'r' = regular table
+),
+
+-- Key constraint kinds each column takes part in: single-column primary keys and
+-- unique constraints, and any foreign key
+column_constraints AS (
+    SELECT
+        con.conrelid AS table_oid,
+        k.attnum,
+        jsonb_agg(
+            CASE con.contype
+                WHEN 'p' THEN 'PRIMARY KEY'
+                WHEN 'u' THEN 'UNIQUE'
+                ELSE 'FOREIGN KEY'
+            END
+            ORDER BY con.contype = 'f', con.contype
+        ) AS constraints
+    FROM
+        pg_constraint con
+    JOIN
+        tables t ON t.oid = con.conrelid
+    CROSS JOIN
+        LATERAL unnest(con.conkey) AS k(attnum)
+    WHERE
+        con.contype = 'f'
+        OR (con.contype IN ('p', 'u') AND cardinality(con.conkey) = 1)
+    GROUP BY
+        con.conrelid, k.attnum
+),
+
+-- Multi-column primary keys and unique constraints, aggregated per table
+composite_keys AS (
+    SELECT
+        con.conrelid AS table_oid,
+        (jsonb_agg(k.columns) FILTER (WHERE con.contype = 'p'))->0 AS primary_key,
+        jsonb_agg(k.columns ORDER BY con.conname) FILTER (WHERE con.contype = 'u') AS unique_constraints
+    FROM
+        pg_constraint con
+    JOIN
+        tables t ON t.oid = con.conrelid
+    CROSS JOIN LATERAL (
+        SELECT array_agg(a.attname ORDER BY key.ord) AS columns
+        FROM unnest(con.conkey) WITH ORDINALITY AS key(attnum, ord)
+        JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = key.attnum
+    ) k
+    WHERE
+        con.contype IN ('p', 'u')
+        AND cardinality(con.conkey) > 1
+    GROUP BY
+        con.conrelid
+),
+
+-- Get all columns, aggregated per table
+columns AS (
+    SELECT
+        a.attrelid AS table_oid,
+        jsonb_agg(
+            jsonb_build_object(
+                'name', a.attname,
+                'type', pg_catalog.format_type(a.atttypid, a.atttypmod),
+                'nullable', NOT a.attnotnull,
+                'default', pg_catalog.pg_get_expr(d.adbin, d.adrelid),
+                'description', col_description(a.attrelid, a.attnum),
+                'constraints', cc.constraints
+            )
+            ORDER BY a.attnum
+        ) AS columns
+    FROM
+        pg_catalog.pg_attribute a
+    JOIN
+        tables t ON t.oid = a.attrelid
+    LEFT JOIN
+        pg_catalog.pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    LEFT JOIN
+        column_constraints cc ON cc.table_oid = a.attrelid AND cc.attnum = a.attnum
+    WHERE
+        a.attnum > 0  -- Skip system columns
+        AND NOT a.attisdropped  -- Skip dropped columns
+    GROUP BY
+        a.attrelid
+),
+
+-- Get all foreign keys, aggregated per table
+foreign_keys AS (
+    SELECT
+        con.conrelid AS table_oid,
+        jsonb_agg(
+            jsonb_build_object(
+                'name', con.conname,
+                'columns', (
+                    SELECT array_agg(a.attname ORDER BY k.ord)
+                    FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+                    JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+                ),
+                'referenced_schema', nr.nspname,
+                'referenced_table', ref_table.relname,
+                'referenced_columns', (
+                    SELECT array_agg(a.attname ORDER BY k.ord)
+                    FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+                    JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+                )
+            )
+            ORDER BY con.conname
+        ) AS foreign_keys
+    FROM
+        pg_constraint con
+    JOIN
+        tables t ON t.oid = con.conrelid
+    JOIN
+        pg_class ref_table ON ref_table.oid = con.confrelid
+    JOIN
+        pg_namespace nr ON nr.oid = ref_table.relnamespace
+    WHERE
+        con.contype = 'f'  -- 'f' = foreign key
+    GROUP BY
+        con.conrelid
+),
+
+-- Get all indexes, aggregated per table
+indexes AS (
+    SELECT
+        ix.indrelid AS table_oid,
+        jsonb_agg(
+            jsonb_build_object(
+                'name', i.relname,
+                'type', am.amname,
+                'is_unique', ix.indisunique,
+                'is_primary', ix.indisprimary,
+                'columns', (
+                    SELECT array_agg(a.attname ORDER BY k.ord)
+                    FROM unnest(ix.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+                    JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = k.attnum
+                )
+            )
+            ORDER BY i.relname
+        ) AS indexes
+    FROM
+        pg_index ix
+    JOIN
+        tables t ON t.oid = ix.indrelid
+    JOIN
+        pg_class i ON i.oid = ix.indexrelid
+    JOIN
+        pg_am am ON am.oid = i.relam
+    GROUP BY
+        ix.indrelid
+),
+
+-- Get all check constraints, aggregated per table
+check_constraints AS (
+    SELECT
+        con.conrelid AS table_oid,
+        jsonb_agg(
+            jsonb_build_object(
+                'name', con.conname,
+                'definition', pg_get_constraintdef(con.oid)
+            )
+            ORDER BY con.conname
+        ) AS check_constraints
+    FROM
+        pg_constraint con
+    JOIN
+        tables t ON t.oid = con.conrelid
+    WHERE
+        con.contype = 'c'  -- 'c' = check constraint
+    GROUP BY
+        con.conrelid
+)
+
+-- Main query to return the schema in JSON format
+SELECT jsonb_build_object(
+    'name', s.schema_name,
+    'description', s.description,
+    'tables', (
+        SELECT COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'name', t.table_name,
+                    'description', t.description,
+                    'row_count', t.row_count,
+                    'columns', COALESCE(c.columns, '[]'::jsonb),
+                    'primary_key', ck.primary_key,
+                    'unique_constraints', ck.unique_constraints,
+                    'foreign_keys', fk.foreign_keys,
+                    'indexes', ix.indexes,
+                    'check_constraints', cc.check_constraints
+                )
+                ORDER BY t.table_name
+            ),
+            '[]'::jsonb
+        )
+        FROM tables t
+        LEFT JOIN columns c ON c.table_oid = t.oid
+        LEFT JOIN composite_keys ck ON ck.table_oid = t.oid
+        LEFT JOIN foreign_keys fk ON fk.table_oid = t.oid
+        LEFT JOIN indexes ix ON ix.table_oid = t.oid
+        LEFT JOIN check_constraints cc ON cc.table_oid = t.oid
+    )
+) AS schema_structure
+FROM schema_info s;
@@ -0,0 +1,19 @@
+-- server/resources/sql/get_schema_relation_statistics.sql
+-- Scan and tuple statistics of table or materialized view $2 in schema $1 from pg_stat_user_tables
+-- One of the independent parts of the table and materialized view details resources
+
+SELECT (
+    SELECT COALESCE(
+        jsonb_build_object(
+            'seq_scan', s.seq_scan,
+            'idx_scan', s.idx_scan,
+            'live_tuples', s.n_live_tup
+        ),
+        '{}'::jsonb
+    )
+    FROM 
+        pg_stat_user_tables s
+    WHERE 
+        s.schemaname = $1
+        AND s.relname = $2
+) AS part;
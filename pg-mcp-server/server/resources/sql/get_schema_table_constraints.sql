@@ -0,0 +1,174 @@
+-- server/resources/sql/get_schema_table_constraints.sql
+-- Primary key, unique, foreign key and check constraints of table $2 in schema $1
+-- One of the independent parts of the table details resource
+
+WITH 
+-- Get all primary and unique constraints
+key_constraints AS (
+    SELECT 
+        con.conname AS constraint_name,
+        con.contype AS constraint_type,
+        CASE 
+            WHEN con.contype = 'p' THEN 'PRIMARY KEY'
+            WHEN con.contype = 'u' THEN 'UNIQUE'
+            ELSE 'OTHER'
+        END AS constraint_type_desc,
+        obj_description(con.oid) AS description,
+        pg_get_constraintdef(con.oid) AS definition,
+        array_agg(a.attname ORDER BY array_position(con.conkey, a.attnum)) AS column_names
+    FROM 
+        pg_constraint con
+    JOIN 
+        pg_namespace n ON n.oid = con.connamespace
+    JOIN 
+        pg_class t ON t.oid = con.conrelid
+    JOIN 
+        pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = ANY(con.conkey)
+    WHERE 
+        n.nspname = $1
+        AND t.relname = $2
+        AND con.contype IN ('p', 'u')  -- 'p' = primary key, 'u' = unique
+    GROUP BY 
+        con.conname, con.contype, con.oid
+    ORDER BY 
+        con.contype, con.conname
+),
+
+-- Get all foreign key constraints
+foreign_keys AS (
+    SELECT 
+        con.conname AS constraint_name,
+        'f' AS constraint_type,
+        'FOREIGN KEY' AS constraint_type_desc,
+        obj_description(con.oid) AS description,
+        pg_get_constraintdef(con.oid) AS definition,
+        array_agg(a.attname ORDER BY array_position(con.conkey, a.attnum)) AS column_names,
+        nr.nspname AS referenced_schema,
+        ref_table.relname AS referenced_table,
+        array_agg(ref_col.attname ORDER BY array_position(con.confkey, ref_col.attnum)) AS referenced_columns,
+        CASE con.confdeltype 
+            WHEN 'a' THEN 'NO ACTION'
+            WHEN 'r' THEN 'RESTRICT'
+            WHEN 'c' THEN 'CASCADE'
+            WHEN 'n' THEN 'SET NULL'
+            WHEN 'd' THEN 'SET DEFAULT'
+            ELSE NULL
+        END AS delete_rule,
+        CASE con.confupdtype
+            WHEN 'a' THEN 'NO ACTION'
+            WHEN 'r' THEN 'RESTRICT'
+            WHEN 'c' THEN 'CASCADE'
+            WHEN 'n' THEN 'SET NULL'
+            WHEN 'd' THEN 'SET DEFAULT'
+            ELSE NULL
+        END AS update_rule
+    FROM 
+        pg_constraint con
+    JOIN 
+        pg_namespace n ON n.oid = con.connamespace
+    JOIN 
+        pg_class t ON t.oid = con.conrelid
+    JOIN 
+        pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = ANY(con.conkey)
+    JOIN 
+        pg_class ref_table ON ref_table.oid = con.confrelid
+    JOIN 
+        pg_namespace nr ON nr.oid = ref_table.relnamespace
+    JOIN 
+        pg_attribute ref_col ON ref_col.attrelid = con.confrelid AND ref_col.attnum = ANY(con.confkey)
+    WHERE 
+        n.nspname = $1
+        AND t.relname = $2
+        AND con.contype = 'f'  -- 'f' = foreign key
+    GROUP BY 
+        con.conname, con.contype, con.oid, nr.nspname, ref_table.relname, con.confdeltype, con.confupdtype
+    ORDER BY 
+        con.conname
+),
+
+-- Get check constraints
+check_constraints AS (
+    SELECT 
+        con.conname AS constraint_name,
+        'c' AS constraint_type,
+        'CHECK' AS constraint_type_desc,
+        obj_description(con.oid) AS description,
+        pg_get_constraintdef(con.oid) AS definition
+    FROM 
+        pg_constraint con
+    JOIN 
+        pg_namespace n ON n.oid = con.connamespace
+    JOIN 
+        pg_class t ON t.oid = con.conrelid
+    WHERE 
+        n.nspname = $1
+        AND t.relname = $2
+        AND con.contype = 'c'  -- 'c' = check constraint
+    ORDER BY 
+        con.conname
+)
+
+SELECT jsonb_build_object(
+    'primary_keys', (
+        SELECT COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'name', kc.constraint_name,
+                    'columns', kc.column_names,
+                    'definition', kc.definition,
+                    'description', kc.description
+                )
+            ),
+            '[]'::jsonb
+        )
+        FROM key_constraints kc
+        WHERE kc.constraint_type = 'p'
+    ),
+    'unique_constraints', (
+        SELECT COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'name', kc.constraint_name,
+                    'columns', kc.column_names,
+                    'definition', kc.definition,
+                    'description', kc.description
+                )
+            ),
+            '[]'::jsonb
+        )
+        FROM key_constraints kc
+        WHERE kc.constraint_type = 'u'
+    ),
+    'foreign_keys', (
+        SELECT COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'name', fk.constraint_name,
+                    'columns', fk.column_names,
+                    'referenced_schema', fk.referenced_schema,
+                    'referenced_table', fk.referenced_table,
+                    'referenced_columns', fk.referenced_columns,
+                    'delete_rule', fk.delete_rule,
+                    'update_rule', fk.update_rule,
+                    'definition', fk.definition,
+                    'description', fk.description
+                )
+            ),
+            '[]'::jsonb
+        )
+        FROM foreign_keys fk
+    ),
+    'check_constraints', (
+        SELECT COALESCE(
+            jsonb_agg(
+                jsonb_build_object(
+                    'name', cc.constraint_name,
+                    'definition', cc.definition,
+                    'description', cc.description
+                )
+            ),
+            '[]'::jsonb
+        )
+        FROM check_constraints cc
+    )
+) AS part;
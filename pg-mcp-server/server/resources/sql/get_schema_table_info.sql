@@ -0,0 +1,33 @@
+-- server/resources/sql/get_schema_table_info.sql
+-- Name, description, row count and sizes of table $2 in schema $1
+-- One of the independent parts of the table details resource; fields are null if the table does not exist
+
+WITH
+table_info AS (
+    SELECT 
+        t.relname AS table_name,
+        obj_description(t.oid) AS description,
+        pg_stat_get_tuples_inserted(t.oid) AS row_count,
+        pg_total_relation_size(t.oid) AS total_size_bytes,
+        pg_table_size(t.oid) AS table_size_bytes,
+        pg_indexes_size(t.oid) AS indexes_size_bytes
+    FROM 
+        pg_class t
+    JOIN 
+        pg_namespace n ON t.relnamespace = n.oid
+    WHERE 
+        n.nspname = $1
+        AND t.relname = $2
+        AND t.relkind = 'r'  -- 'r' = regular table
+)
+
+SELECT jsonb_build_object(
+    'name', (SELECT table_name FROM table_info),
+    'description', (SELECT description FROM table_info),
+    'row_count', (SELECT row_count FROM table_info),
+    'size', jsonb_build_object(
+        'total_bytes', (SELECT total_size_bytes FROM table_info),
+        'table_bytes', (SELECT table_size_bytes FROM table_info),
+        'indexes_bytes', (SELECT indexes_size_bytes FROM table_info)
+    )
+) AS part;
@@ -0,0 +1,238 @@
+-- server/resources/sql/get_schema_tables.sql
+-- Details for several tables of one schema in a single catalog pass
+-- $1 = schema name, $2 = table names (text[], NULL for any), $3 = LIKE pattern (NULL for any)
+-- Returns {"tables": [...]}, each element shaped like the "table" object of the table details resource
+
+WITH
+-- Tables selected by name list and/or pattern
+tables AS (
+    SELECT
+        t.oid,
+        t.relname AS table_name,
+        obj_description(t.oid) AS description,
+        pg_stat_get_tuples_inserted(t.oid) AS row_count,
+        pg_total_relation_size(t.oid) AS total_size_bytes,
+        pg_table_size(t.oid) AS table_size_bytes,
+        pg_indexes_size(t.oid) AS indexes_size_bytes
+    FROM
+        pg_class t
+    JOIN
+        pg_namespace n ON t.relnamespace = n.oid
+    WHERE
+        n.nspname = $1
+        AND t.relkind = 'r'  -- 'r' = regular table
+        AND ($2::text[] IS NULL OR t.relname = ANY($2::text[]))
+        AND ($3::text IS NULL OR t.relname LIKE $3::text)
+),
+
+-- Columns, aggregated per table
+columns AS (
+    SELECT
+        a.attrelid AS table_oid,
+        jsonb_agg(
+            jsonb_build_object(
+                'name', a.attname,
+                'type', pg_catalog.format_type(a.atttypid, a.atttypmod),
+                'nullable', NOT a.attnotnull,
+                'default', CASE WHEN a.atthasdef THEN pg_catalog.pg_get_expr(d.adbin, d.adrelid) END,
+                'description', col_description(a.attrelid, a.attnum),
+                'position', a.attnum,
+                'is_identity', a.attidentity IN ('a', 'd'),
+                'identity_generation', CASE
+                    WHEN a.attidentity = 'a' THEN 'ALWAYS'
+                    WHEN a.attidentity = 'd' THEN 'BY DEFAULT'
+                    ELSE NULL
+                END,
+                'storage', CASE
+                    WHEN a.attstorage = 'p' THEN 'plain'
+                    WHEN a.attstorage = 'e' THEN 'external'
+                    WHEN a.attstorage = 'm' THEN 'main'
+                    WHEN a.attstorage = 'x' THEN 'extended'
+                    ELSE a.attstorage::text
+                END
+            )
+            ORDER BY a.attnum
+        ) AS columns
+    FROM
+        pg_catalog.pg_attribute a
+    JOIN
+        tables t ON t.oid = a.attrelid
+    LEFT JOIN
+        pg_catalog.pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE
+        a.attnum > 0  -- Skip system columns
+        AND NOT a.attisdropped  -- Skip dropped columns
+    GROUP BY
+        a.attrelid
+),
+
+-- Primary key, unique, foreign key and check constraints, aggregated per table
+constraints AS (
+    SELECT
+        con.conrelid AS table_oid,
+        jsonb_agg(
+            jsonb_build_object(
+                'name', con.conname,
+                'columns', k.column_names,
+                'definition', pg_get_constraintdef(con.oid),
+                'description', obj_description(con.oid)
+            )
+            ORDER BY con.conname
+        ) FILTER (WHERE con.contype = 'p') AS primary_keys,
+        jsonb_agg(
+            jsonb_build_object(
+                'name', con.conname,
+                'columns', k.column_names,
+                'definition', pg_get_constraintdef(con.oid),
+                'description', obj_description(con.oid)
+            )
+            ORDER BY con.conname
+        ) FILTER (WHERE con.contype = 'u') AS unique_constraints,
+        jsonb_agg(
+            jsonb_build_object(
+                'name', con.conname,
+                'columns', k.column_names,
+                'referenced_schema', nr.nspname,
+                'referenced_table', ref_table.relname,
+                'referenced_columns', k.referenced_columns,
+                'delete_rule', CASE con.confdeltype
+                    WHEN 'a' THEN 'NO ACTION'
+                    WHEN 'r' THEN 'RESTRICT'
+                    WHEN 'c' THEN 'CASCADE'
+                    WHEN 'n' THEN 'SET NULL'
+                    WHEN 'd' THEN 'SET DEFAULT'
+                    ELSE NULL
+                END,
+                'update_rule', CASE con.confupdtype
+                    WHEN 'a' THEN 'NO ACTION'
+                    WHEN 'r' THEN 'RESTRICT'
+                    WHEN 'c' THEN 'CASCADE'
+                    WHEN 'n' THEN 'SET NULL'
+                    WHEN 'd' THEN 'SET DEFAULT'
+                    ELSE NULL
+                END,
+                'definition', pg_get_constraintdef(con.oid),
+                'description', obj_description(con.oid)
+            )
+            ORDER BY con.conname
+        ) FILTER (WHERE con.contype = 'f') AS foreign_keys,
+        jsonb_agg(
+            jsonb_build_object(
+                'name', con.conname,
+                'definition', pg_get_constraintdef(con.oid),
+                'description', obj_description(con.oid)
+            )
+            ORDER BY con.conname
+        ) FILTER (WHERE con.contype = 'c') AS check_constraints
+    FROM
+        pg_constraint con
+    JOIN
+        tables t ON t.oid = con.conrelid
+    LEFT JOIN
+        pg_class ref_table ON ref_table.oid = con.confrelid
+    LEFT JOIN
+        pg_namespace nr ON nr.oid = ref_table.relnamespace
+    CROSS JOIN LATERAL (
+        SELECT
+            (SELECT array_agg(a.attname ORDER BY key.ord)
+             FROM unnest(con.conkey) WITH ORDINALITY AS key(attnum, ord)
+             JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = key.attnum) AS column_names,
+            (SELECT array_agg(a.attname ORDER BY key.ord)
+             FROM unnest(con.confkey) WITH ORDINALITY AS key(attnum, ord)
+             JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = key.attnum) AS referenced_columns
+    ) k
+    WHERE
+        con.contype IN ('p', 'u', 'f', 'c')
+    GROUP BY
+        con.conrelid
+),
+
+-- Indexes, aggregated per table
+indexes AS (
+    SELECT
+        ix.indrelid AS table_oid,
+        jsonb_agg(
+            jsonb_build_object(
+                'name', i.relname,
+                'type', am.amname,
+                'definition', pg_get_indexdef(i.oid),
+                'is_unique', ix.indisunique,
+                'is_primary', ix.indisprimary,
+                'is_valid', ix.indisvalid,
+                'column_names', k.column_names,
+                'column_expressions', k.column_expressions,
+                'size', jsonb_build_object(
+                    'pages', i.relpages,
+                    'rows', i.reltuples
+                ),
+                'description', obj_description(i.oid)
+            )
+            ORDER BY i.relname
+        ) AS indexes
+    FROM
+        pg_index ix
+    JOIN
+        tables t ON t.oid = ix.indrelid
+    JOIN
+        pg_class i ON i.oid = ix.indexrelid
+    JOIN
+        pg_am am ON am.oid = i.relam
+    CROSS JOIN LATERAL (
+        SELECT
+            array_agg(a.attname ORDER BY key.ord) AS column_names,
+            array_agg(pg_get_indexdef(i.oid, key.ord::int, false) ORDER BY key.ord) AS column_expressions
+        FROM
+            unnest(ix.indkey::int[]) WITH ORDINALITY AS key(attnum, ord)
+        LEFT JOIN
+            pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = key.attnum
+    ) k
+    GROUP BY
+        ix.indrelid
+)
+
+-- One JSON document for all selected tables
+SELECT jsonb_build_object(
+    'tables',
+    COALESCE(
+        jsonb_agg(
+            jsonb_build_object(
+                'name', t.table_name,
+                'description', t.description,
+                'row_count', t.row_count,
+                'size', jsonb_build_object(
+                    'total_bytes', t.total_size_bytes,
+                    'table_bytes', t.table_size_bytes,
+                    'indexes_bytes', t.indexes_size_bytes
+                ),
+                'columns', COALESCE(c.columns, '[]'::jsonb),
+                'constraints', jsonb_build_object(
+                    'primary_keys', COALESCE(con.primary_keys, '[]'::jsonb),
+                    'unique_constraints', COALESCE(con.unique_constraints, '[]'::jsonb),
+                    'foreign_keys', COALESCE(con.foreign_keys, '[]'::jsonb),
+                    'check_constraints', COALESCE(con.check_constraints, '[]'::jsonb)
+                ),
+                'indexes', COALESCE(i.indexes, '[]'::jsonb),
+                'statistics', CASE
+                    WHEN s.relid IS NULL THEN '{}'::jsonb
+                    ELSE jsonb_build_object(
+                        'seq_scan', s.seq_scan,
+                        'idx_scan', s.idx_scan,
+                        'live_tuples', s.n_live_tup
+                    )
+                END
+            )
+            ORDER BY t.table_name
+        ),
+        '[]'::jsonb
+    )
+) AS tables_details
+FROM
+    tables t
+LEFT JOIN
+    columns c ON c.table_oid = t.oid
+LEFT JOIN
+    constraints con ON con.table_oid = t.oid
+LEFT JOIN
+    indexes i ON i.table_oid = t.oid
+LEFT JOIN
+    pg_stat_user_tables s ON s.relid = t.oid;
@@ -0,0 +1,50 @@
+-- server/resources/sql/get_schema_view_columns.sql
+-- Columns of materialized view $2 in schema $1, in ordinal order
+-- One of the independent parts of the materialized view details resource
+
+WITH
+columns AS (
+    SELECT 
+        a.attname AS column_name,
+        pg_catalog.format_type(a.atttypid, a.atttypmod) AS data_type,
+        NOT a.attnotnull AS is_nullable,
+        (SELECT pg_catalog.pg_get_expr(adbin, adrelid) FROM pg_catalog.pg_attrdef d
+         WHERE d.adrelid = a.attrelid AND d.adnum = a.attnum AND a.atthasdef) AS column_default,
+        col_description(a.attrelid, a.attnum) AS description,
+        a.attnum AS ordinal_position,
+        CASE 
+            WHEN a.attstorage = 'p' THEN 'plain'
+            WHEN a.attstorage = 'e' THEN 'external'
+            WHEN a.attstorage = 'm' THEN 'main'
+            WHEN a.attstorage = 'x' THEN 'extended'
+            ELSE a.attstorage::text
+        END AS storage_type_desc
+    FROM 
+        pg_catalog.pg_attribute a
+    JOIN 
+        pg_catalog.pg_class c ON c.oid = a.attrelid
+    JOIN 
+        pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+    WHERE 
+        n.nspname = $1
+        AND c.relname = $2
+        AND a.attnum > 0  -- Skip system columns
+        AND NOT a.attisdropped  -- Skip dropped columns
+)
+
+SELECT COALESCE(
+    jsonb_agg(
+        jsonb_build_object(
+            'name', c.column_name,
+            'type', c.data_type,
+            'nullable', c.is_nullable,
+            'default', c.column_default,
+            'description', c.description,
+            'position', c.ordinal_position,
+            'storage', c.storage_type_desc
+        )
+        ORDER BY c.ordinal_position
+    ),
+    '[]'::jsonb
+) AS part
+FROM columns c;
@@ -0,0 +1,57 @@
+-- server/resources/sql/get_schema_view_indexes.sql
+-- Indexes of materialized view $2 in schema $1 with their columns
+-- One of the independent parts of the materialized view details resource
+
+WITH 
+-- Get all indexes 
+indexes AS (
+    SELECT 
+        i.relname AS index_name,
+        pg_get_indexdef(i.oid) AS index_definition,
+        obj_description(i.oid) AS description,
+        am.amname AS index_type,
+        ix.indisunique AS is_unique,
+        ix.indisprimary AS is_primary,
+        ix.indisvalid AS is_valid,
+        array_agg(a.attname ORDER BY array_position(ix.indkey::int[], a.attnum)) AS column_names,
+        array_agg(pg_get_indexdef(i.oid, k.i::int, false) ORDER BY k.i) AS column_expressions
+    FROM 
+        pg_index ix
+    JOIN 
+        pg_class i ON i.oid = ix.indexrelid
+    JOIN 
+        pg_class t ON t.oid = ix.indrelid
+    JOIN 
+        pg_namespace n ON n.oid = t.relnamespace
+    JOIN 
+        pg_am am ON i.relam = am.oid
+    LEFT JOIN 
+        LATERAL unnest(ix.indkey::int[]) WITH ORDINALITY AS k(attnum, i) ON TRUE
+    LEFT JOIN 
+        pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+    WHERE 
+        n.nspname = $1
+        AND t.relname = $2
+    GROUP BY 
+        i.relname, i.oid, am.amname, ix.indisunique, ix.indisprimary, ix.indisvalid
+    ORDER BY 
+        i.relname
+)
+
+SELECT COALESCE(
+    jsonb_agg(
+        jsonb_build_object(
+            'name', i.index_name,
+            'type', i.index_type,
+            'definition', i.index_definition,
+            'is_unique', i.is_unique,
+            'is_primary', i.is_primary,
+            'is_valid', i.is_valid,
+            'column_names', i.column_names,
+            'column_expressions', i.column_expressions,
+            'description', i.description
+        )
+    ),
+    '[]'::jsonb
+) AS part
+FROM indexes i;
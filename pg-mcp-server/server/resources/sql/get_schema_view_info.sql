@@ -0,0 +1,38 @@
+-- server/resources/sql/get_schema_view_info.sql
+-- Name, description, row count, definition and sizes of materialized view $2 in schema $1
+-- One of the independent parts of the materialized view details resource; fields are null if the view does not exist
+
+WITH
+view_info AS (
+    SELECT 
+        v.relname AS view_name,
+        obj_description(v.oid) AS description,
+        pg_stat_get_tuples_inserted(v.oid) AS row_count,
+        pg_total_relation_size(v.oid) AS total_size_bytes,
+        pg_table_size(v.oid) AS data_size_bytes,
+        pg_indexes_size(v.oid) AS indexes_size_bytes,
+        -- Get the view definition SQL
+        pg_get_viewdef(v.oid) AS view_definition
+    FROM 
+        pg_class v
+    JOIN 
+        pg_namespace n ON v.relnamespace = n.oid
+    WHERE 
+        n.nspname = $1
+        AND v.relname = $2
+        AND v.relkind = 'm'  -- 'm' = materialized view
+)
+
+SELECT jsonb_build_object(
+    'name', (SELECT view_name FROM view_info),
+    'description', (SELECT description FROM view_info),
+    'row_count', (SELECT row_count FROM view_info),
+    'definition', (SELECT view_definition FROM view_info),
+    'size', jsonb_build_object(
+        'total_bytes', (SELECT total_size_bytes FROM view_info),
+        'data_bytes', (SELECT data_size_bytes FROM view_info),
+        'indexes_bytes', (SELECT indexes_size_bytes FROM view_info)
+    ),
+    -- PostgreSQL does not record when a materialized view was last refreshed
+    'last_refresh', NULL
+) AS part;
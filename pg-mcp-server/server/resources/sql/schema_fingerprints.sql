@@ -0,0 +1,36 @@
+-- server/resources/sql/schema_fingerprints.sql
+-- One fingerprint per non-system schema, used to refresh the database snapshot
+-- incrementally: only schemas whose fingerprint changed are re-introspected
+SELECT
+    n.nspname AS schema_name,
+    md5(concat_ws('|',
+        n.xmin::text,
+        (SELECT max(c.xmin::text::bigint) || '/' || count(*)
+         FROM pg_class c
+         WHERE c.relnamespace = n.oid),
+        (SELECT max(a.xmin::text::bigint) || '/' || count(*)
+         FROM pg_attribute a
+         JOIN pg_class c ON c.oid = a.attrelid
+         WHERE c.relnamespace = n.oid),
+        (SELECT max(con.xmin::text::bigint) || '/' || count(*)
+         FROM pg_constraint con
+         WHERE con.connamespace = n.oid),
+        -- Foreign keys render the referenced table's name, which may live in another schema
+        (SELECT max(ref.xmin::text::bigint)
+         FROM pg_constraint con
+         JOIN pg_class ref ON ref.oid = con.confrelid
+         WHERE con.connamespace = n.oid
+           AND con.contype = 'f'),
+        (SELECT max(d.xmin::text::bigint) || '/' || count(*)
+         FROM pg_description d
+         JOIN pg_class c ON c.oid = d.objoid AND d.classoid = 'pg_class'::regclass
+         WHERE c.relnamespace = n.oid),
+        obj_description(n.oid, 'pg_namespace')
+    )) AS fingerprint
+FROM
+    pg_namespace n
+WHERE
+    n.nspname NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
+    AND n.nspname NOT LIKE 'pg_%'
+ORDER BY
+    n.nspname;
@@ -0,0 +1,214 @@
+# server/results.py
+import json
+import time
+from collections import OrderedDict
+from sqlglot import parse_one, exp
+from server.logging_config import get_logger
+
+logger = get_logger("pg-mcp.results")
+
+# Functions whose result changes between executions; queries calling them are never cached
+VOLATILE_FUNCTIONS = {
+    "rand", "random", "uuid", "gen_random_uuid", "uuid_generate_v1", "uuid_generate_v4",
+    "current_timestamp", "current_date", "current_time", "localtime", "localtimestamp",
+    "now", "clock_timestamp", "statement_timestamp", "transaction_timestamp", "timeofday",
+    "nextval", "currval", "lastval", "setval", "pg_sleep", "txid_current"
+}
+
+# SQL value keywords sqlglot parses as plain (unquoted) column references
+VOLATILE_KEYWORDS = {"current_timestamp", "current_date", "current_time", "localtime", "localtimestamp"}
+
+# Data version of the referenced tables: insert/update/delete counters from
+# pg_stat_user_tables plus relfilenode, which changes on TRUNCATE
+DATA_VERSION_SQL = """
+SELECT md5(string_agg(
+    c.oid::text || ':' || c.relfilenode::text || ':' ||
+    coalesce(s.n_tup_ins + s.n_tup_upd + s.n_tup_del, 0)::text,
+    ',' ORDER BY c.oid
+))
+FROM unnest($1::text[], $2::text[]) AS t(schema_name, table_name)
+JOIN pg_class c ON c.oid = to_regclass(
+    CASE WHEN t.schema_name IS NULL THEN quote_ident(t.table_name)
+    ELSE quote_ident(t.schema_name) || '.' || quote_ident(t.table_name) END
+)
+LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+"""
+
+def _identifier_name(identifier):
+    # PostgreSQL folds unquoted identifiers to lower case
+    if identifier is None:
+        return None
+    return identifier.this if identifier.quoted else identifier.this.lower()
+
+class CachedResult:
+    """A query result together with the data version it was read under."""
+
+    def __init__(self, value, size, tables, version):
+        self.value = value
+        self.size = size
+        self.tables = tables
+        self.version = version
+        self.stored_at = self.checked_at = time.monotonic()
+
+class ResultCache:
+    """
+    Optional cache of pg_query results for repeated read-only queries.
+
+    Entries are keyed by connection ID, the query as normalized by sqlglot, the
+    parameters and the output format. Memory is bounded by ``max_bytes`` (the
+    JSON size of the results) with least recently used entries evicted first,
+    and every entry expires after ``ttl`` seconds.
+
+    With ``track_tables`` enabled an entry is also dropped once the
+    modification counters of the tables it reads from change. The counters are
+    re-checked at most every ``check_interval`` seconds per entry. They are only
+    updated once the writing transaction has committed and its statistics are
+    flushed, and views are only covered by the TTL, so the cache should only be
+    enabled where slightly stale results are acceptable.
+    """
+
+    def __init__(self, db, max_bytes=0, ttl=60.0, track_tables=True, check_interval=1.0):
+        self._db = db
+        self._entries = OrderedDict()  # key -> CachedResult
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.track_tables = track_tables
+        self.check_interval = check_interval
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def analyze(self, query):
+        """
+        Parse a query for caching.
+
+        Returns:
+            Tuple of (normalized SQL, referenced (schema, table) names), or None
+            if the query is not a plain SELECT, samples a table or calls a
+            volatile function
+        """
+        try:
+            ast = parse_one(query, read="postgres")
+        except Exception as e:
+            logger.debug(f"Not caching unparseable query: {e}")
+            return None
+
+        if not isinstance(ast, exp.Query) or ast.find(exp.Lock) or ast.find(exp.TableSample):
+            return None
+
+        for func in ast.find_all(exp.Func):
+            name = func.name if isinstance(func, exp.Anonymous) else func.sql_name()
+            if name.lower() in VOLATILE_FUNCTIONS:
+                return None
+        for column in ast.find_all(exp.Column):
+            identifier = column.this
+            if (not column.table and isinstance(identifier, exp.Identifier)
+                    and not identifier.quoted and identifier.this.lower() in VOLATILE_KEYWORDS):
+                return None
+
+        ctes = {cte.alias for cte in ast.find_all(exp.CTE)}
+        tables = sorted({
+            (_identifier_name(table.args.get("db")), _identifier_name(table.this))
+            for table in ast.find_all(exp.Table)
+            if table.name and not (not table.db and table.name in ctes)
+        }, key=lambda name: (name[0] or "", name[1]))
+        return ast.sql(dialect="postgres"), tuple(tables)
+
+    async def _data_version(self, conn_id, tables):
+        if not self.track_tables or not tables:
+            return None
+        async with self._db.get_connection(conn_id) as conn:
+            return await conn.fetchval(
+                DATA_VERSION_SQL, [schema for schema, _ in tables], [name for _, name in tables]
+            )
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+
+    async def get_or_execute(self, conn_id, query, params, format, execute, options=()):
+        """
+        Return a cached result or await ``execute()`` and cache what it returns.
+
+        Args:
+            conn_id: Connection ID the query runs against
+            query: SQL text of the query
+            params: Query parameters (part of the key)
+            format: Output format (part of the key)
+            execute: Coroutine function running the query on a miss
+            options: Other settings that change the result, such as query limits (part of the key)
+        """
+        if not self.enabled:
+            return await execute()
+
+        analyzed = self.analyze(query)
+        if analyzed is None:
+            self.uncacheable += 1
+            return await execute()
+        normalized, tables = analyzed
+
+        key = (conn_id, normalized, json.dumps(params or [], default=str), format, options)
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            fresh = now - entry.stored_at < self.ttl
+            if fresh and entry.version is not None and now - entry.checked_at >= self.check_interval:
+                fresh = await self._data_version(conn_id, tables) == entry.version
+                entry.checked_at = now
+            if fresh:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if self._entries.get(key) is entry:
+                self._remove(key)
+                self.invalidations += 1
+
+        self.misses += 1
+        # Read the version first so writes racing with the query invalidate the entry
+        version = await self._data_version(conn_id, tables)
+        value = await execute()
+
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return value
+
+        if key in self._entries:
+            # A concurrent miss for the same query got here first
+            self._remove(key)
+        self._entries[key] = CachedResult(value, size, tables, version)
+        self.size += size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+        return value
+
+    def invalidate(self, conn_id=None):
+        """Drop cached results for one connection ID, or for all connections."""
+        for key in list(self._entries):
+            if conn_id is None or key[0] == conn_id:
+                self._remove(key)
+                self.invalidations += 1
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "uncacheable": self.uncacheable,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
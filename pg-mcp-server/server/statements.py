@@ -0,0 +1,16 @@
+# server/statements.py
+def normalize_sql(query):
+    """
+    Normalize SQL text for statement reuse.
+
+    asyncpg keeps an LRU of prepared statements on every pooled connection,
+    keyed by the exact query text (``statement_cache_size`` in Database), so
+    giving repeated queries one canonical spelling lets them skip parse/plan on
+    connections that have already seen them. Only leading/trailing whitespace
+    and trailing semicolons are removed; the body is left untouched so literals
+    and comments keep their meaning.
+    """
+    normalized = query.strip()
+    while normalized.endswith(';'):
+        normalized = normalized[:-1].rstrip()
+    return normalized
@@ -33,8 +33,25 @@ def register_connection_tools():
     #     return {"conn_id": conn_id}
 
     @mcp.tool()
-    async def connect(connection_string: str, *, ctx: Context):
-        """Register a database connection string and return its connection ID."""
+    async def connect(
+        connection_string: str,
+        pool_policy: dict | None = None,
+        query_limits: dict | None = None,
+        *,
+        ctx: Context
+    ):
+        """
+        Register a database connection string and return its connection ID.
+        
+        Args:
+            connection_string: PostgreSQL connection string (required)
+            pool_policy: Optional pool settings for this connection, any of
+                         min_size, max_size, max_queries, max_inactive_connection_lifetime,
+                         acquire_timeout, command_timeout and max_idle_time
+            query_limits: Optional pg_query budgets for this connection, any of
+                          statement_timeout (seconds), max_rows and max_cost
+            ctx: Request context (injected by the framework)
+        """
         db = mcp.state["db"]
         
         # 디버깅 로그 추가
@@ -44,6 +61,10 @@ def register_connection_tools():
         conn_id = db.register_connection(connection_string)
         
         logger.info(f"Generated conn_id: {conn_id}")
+        if pool_policy:
+            db.set_pool_policy(conn_id, **pool_policy)
+        if query_limits:
+            mcp.state["guard"].set_limits(conn_id, **query_limits)
         logger.info(f"Connection map now contains: {list(db._connection_map.keys())}")
         
         return {"conn_id": conn_id}
@@ -69,10 +90,17 @@ def register_connection_tools():
             logger.warning(f"Attempted to disconnect unknown connection ID: {conn_id}")
             return {"success": False, "error": "Unknown connection ID"}
         
-        # Close the connection pool
+        # Close any open cursors and the connection pool
         try:
+            await mcp.state["cursors"].close_all(conn_id)
             await db.close(conn_id)
+            mcp.state["results"].invalidate(conn_id)
+            mcp.state["schema_cache"].invalidate(conn_id)
+            mcp.state["snapshot"].discard(conn_id)
+            mcp.state["prompts"].discard(conn_id)
             # Also remove from the connection mappings
+            db._pool_policies.pop(conn_id, None)
+            mcp.state["guard"].discard(conn_id)
             connection_string = db._connection_map.pop(conn_id, None)
             if connection_string in db._reverse_map:
                 del db._reverse_map[connection_string]
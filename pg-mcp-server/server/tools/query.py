@@ -2,10 +2,13 @@
 from server.config import mcp
 from mcp.server.fastmcp import Context
 from server.logging_config import get_logger
+from server.encoding import encode_records, validate_format
+from server.guard import explain
+from server.statements import normalize_sql
 
 logger = get_logger("pg-mcp.tools.query")
 
-async def execute_query(query: str, conn_id: str, params=None, ctx=Context):
+async def execute_query(query: str, conn_id: str, params=None, ctx=Context, format="rows", limits=None):
     """
     Execute a read-only SQL query against the PostgreSQL database.
     
@@ -14,9 +17,13 @@ async def execute_query(query: str, conn_id: str, params=None, ctx=Context):
         conn_id: Connection ID (required)
         params: Parameters for the query (optional)
         ctx: Optional request context
+        format: Output format, see server.encoding.encode_records (default "rows")
+        limits: Query limits from QueryGuard.get_limits to enforce (optional)
         
     Returns:
-        Query results as a list of dictionaries
+        Query results as a list of dictionaries, or the encoded result for other formats.
+        When limits set max_rows, a dictionary that also carries "truncated" (rows
+        under "rows" for the "rows" format), like a pg_fetch page
     """
     
     # Access the database from the request context
@@ -31,14 +38,43 @@ async def execute_query(query: str, conn_id: str, params=None, ctx=Context):
         
     logger.info(f"Executing query on connection ID {conn_id}: {query}")
     
+    # Canonical statement text, so repeated queries reuse the connection's prepared statement
+    statement = normalize_sql(query)
+    
     async with db.get_connection(conn_id) as conn:
-        # Ensure we're in read-only mode
-        await conn.execute("SET TRANSACTION READ ONLY")
+        # Read-only mode is enforced by the pool's default_transaction_read_only
+        # setting, which costs no extra round trip per query
         
         # Execute the query
         try:
-            records = await conn.fetch(query, *(params or []))
-            return [dict(record) for record in records]
+            timeout = None
+            max_rows = None
+            if limits:
+                statement = await mcp.state["guard"].check(conn, statement, params, limits)
+                timeout = limits["statement_timeout"]
+                max_rows = limits["max_rows"]
+            records = await conn.fetch(statement, *(params or []), timeout=timeout)
+            attributes = None
+            if not records and format != "rows":
+                # Empty results carry no column names; take them from the statement
+                attributes = (await conn.prepare(statement, timeout=timeout)).get_attributes()
+            if max_rows is None:
+                return encode_records(records, format, attributes)
+
+            truncated = len(records) > max_rows
+            if truncated:
+                mcp.state["guard"].truncated += 1
+                logger.info(f"Result capped at {max_rows} rows on connection ID {conn_id}")
+                records = records[:max_rows]
+            encoded = encode_records(records, format, attributes)
+            result = {"rows": encoded} if format == "rows" else encoded
+            result["truncated"] = truncated
+            return result
+        except TimeoutError:
+            # Without a per-call timeout the pool's command_timeout is what fired
+            applied = timeout if timeout is not None else db.get_pool_policy(conn_id)["command_timeout"]
+            logger.error(f"Query cancelled after {applied}s on connection ID {conn_id}")
+            raise ValueError(f"Query cancelled: exceeded the statement timeout of {applied} seconds")
         except Exception as e:
             # Log the error but don't couple to specific error types
             logger.error(f"Query execution error: {e}")
@@ -49,7 +85,16 @@ def register_query_tools():
     logger.debug("Registering query tools")
     
     @mcp.tool()
-    async def pg_query(query: str, conn_id: str, params=None):
+    async def pg_query(
+        query: str,
+        conn_id: str,
+        params=None,
+        page_size: int | None = None,
+        format: str = "rows",
+        timeout: float | None = None,
+        max_rows: int | None = None,
+        max_cost: float | None = None
+    ):
         """
         Execute a read-only SQL query against the PostgreSQL database.
         
@@ -57,12 +102,74 @@ def register_query_tools():
             query: The SQL query to execute (must be read-only)
             conn_id: Connection ID previously obtained from the connect tool
             params: Parameters for the query (optional)
+            page_size: If set, stream the result through a server-side cursor and
+                       return only the first page of this many rows (optional)
+            format: "rows" for a list of objects (default), "columns" for one header
+                    plus row arrays, or "arrow" for a base64 Arrow IPC stream
+            timeout: Cancel the query after this many seconds (optional)
+            max_rows: Cap the result at this many rows; the result then carries a
+                      "truncated" flag (optional)
+            max_cost: Reject the query if its estimated plan cost is higher (optional)
+            
+        Limits can only be tightened per call; the server and connection
+        settings still apply.
+            
+        Returns:
+            Query results in the requested format. When page_size is set, a
+            dictionary that also carries "has_more" and a "cursor_id" for pg_fetch;
+            when a row limit applies, a dictionary that also carries "truncated"
+        """
+        validate_format(format)
+        limits = mcp.state["guard"].get_limits(
+            conn_id, statement_timeout=timeout, max_rows=max_rows, max_cost=max_cost
+        )
+        
+        if page_size is not None:
+            logger.info(f"Opening cursor on connection ID {conn_id}: {query}")
+            if limits["max_cost"] is not None:
+                # Paged results need no row cap, but expensive plans are still refused
+                async with mcp.state["db"].get_connection(conn_id) as conn:
+                    await mcp.state["guard"].check(conn, query, params, {**limits, "max_rows": None})
+            return await mcp.state["cursors"].open(
+                conn_id, query, params, page_size, format, statement_timeout=limits["statement_timeout"]
+            )
+
+        # Execute the query using the connection ID, through the result cache if enabled
+        return await mcp.state["results"].get_or_execute(
+            conn_id, query, params, format,
+            lambda: execute_query(query, conn_id, params, format=format, limits=limits),
+            # Every limit can change the outcome (a cap, a rejection or a timeout)
+            options=tuple(sorted(limits.items()))
+        )
+
+    @mcp.tool()
+    async def pg_fetch(cursor_id: str, page_size: int | None = None):
+        """
+        Fetch the next page of rows from a cursor opened by pg_query.
+        
+        Args:
+            cursor_id: Cursor ID returned by a paginated pg_query or previous pg_fetch
+            page_size: Number of rows to return (optional, defaults to the server page size)
             
         Returns:
-            Query results as a list of dictionaries
+            Page of rows in the cursor's format, with "has_more" and "cursor_id"
+            (null once the result is exhausted)
+        """
+        return await mcp.state["cursors"].fetch(cursor_id, page_size)
+
+    @mcp.tool()
+    async def pg_close_cursor(cursor_id: str):
         """
-        # Execute the query using the connection ID 
-        return await execute_query(query, conn_id, params)
+        Close a cursor opened by pg_query before reading all of its pages.
+        
+        Args:
+            cursor_id: Cursor ID returned by a paginated pg_query or pg_fetch
+            
+        Returns:
+            Dictionary indicating success status
+        """
+        closed = await mcp.state["cursors"].close(cursor_id)
+        return {"success": closed}
         
     @mcp.tool()
     async def pg_explain(query: str, conn_id: str, params=None):
@@ -77,11 +184,10 @@ def register_query_tools():
         Returns:
             Complete JSON-formatted execution plan
         """
-        # Prepend EXPLAIN to the query
-        explain_query = f"EXPLAIN (FORMAT JSON) {query}"
-        
-        # Execute the explain query
-        result = await execute_query(explain_query, conn_id, params)
+        db = mcp.state["db"]
+        async with db.get_connection(conn_id) as conn:
+            # Same planning path the query guard uses for its budget checks
+            records = await explain(conn, query, params)
         
         # Return the complete result
-        return result
\ No newline at end of file
+        return encode_records(records)
\ No newline at end of file
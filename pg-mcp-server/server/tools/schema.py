@@ -0,0 +1,59 @@
+# server/tools/schema.py
+from server.config import mcp
+from server.logging_config import get_logger
+from server.resources.schema import fetch_catalog_json, parse_document
+from server.resources.compact import check_format, render_table_details
+
+logger = get_logger("pg-mcp.tools.schema")
+
+def glob_to_like(pattern):
+    """Translate a shell-style glob (* and ?) into a LIKE pattern, escaping LIKE wildcards."""
+    escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "%").replace("?", "_")
+
+def register_schema_tools():
+    """Register batch schema introspection tools with the MCP server."""
+    logger.debug("Registering schema tools")
+
+    @mcp.tool()
+    async def pg_describe_tables(
+        conn_id: str,
+        schema: str,
+        tables: list[str] | None = None,
+        pattern: str | None = None,
+        format: str = "json"
+    ):
+        """
+        Get details for several tables of a schema in one call, instead of reading
+        pgmcp://{conn_id}/schemas/{schema}/tables/{table} once per table.
+        
+        Args:
+            conn_id: Connection ID previously obtained from the connect tool
+            schema: Schema name
+            tables: Table names to describe (optional)
+            pattern: Glob matched against table names, e.g. "order_*" (optional).
+                     Without tables or pattern, every table in the schema is described.
+            format: "json" for the same details as the table resource, or "compact"
+                    for one DDL-like line per table
+            
+        Returns:
+            {"tables": [...]} in table name order, plus "missing" for requested names
+            that were not found; or the compact text
+        """
+        check_format(format)
+        params = [schema, list(tables) if tables else None, glob_to_like(pattern) if pattern else None]
+        details = parse_document(await fetch_catalog_json(
+            conn_id, "get_schema_tables.sql", "tables_details", params, default={"tables": []}
+        ))
+
+        found = {table["name"] for table in details["tables"]}
+        missing = [name for name in tables or [] if name not in found]
+
+        if format == "compact":
+            lines = [render_table_details(schema, {"table": table}) for table in details["tables"]]
+            if missing:
+                lines.append(f"-- not found: {', '.join(missing)}")
+            return "\n".join(lines)
+        if missing:
+            return {**details, "missing": missing}
+        return details
@@ -0,0 +1,27 @@
+# server/tools/stats.py
+from server.config import mcp
+from server.logging_config import get_logger
+
+logger = get_logger("pg-mcp.tools.stats")
+
+def register_stats_tools():
+    """Register server statistics tools with the MCP server."""
+    logger.debug("Registering stats tools")
+
+    @mcp.tool()
+    async def pg_server_stats():
+        """
+        Report internal server statistics such as cache hit rates, pool usage and open cursors.
+        
+        Returns:
+            Dictionary of statistics grouped by component
+        """
+        return {
+            "schema_cache": mcp.state["schema_cache"].stats(),
+            "snapshot": mcp.state["snapshot"].stats(),
+            "prompts": mcp.state["prompts"].stats(),
+            "results": mcp.state["results"].stats(),
+            "guard": mcp.state["guard"].stats(),
+            "pools": mcp.state["db"].pool_stats(),
+            "cursors": {"open": mcp.state["cursors"].count()}
+        }
@@ -25,13 +25,18 @@ def default_serializer(obj):
         return float(obj)
     return str(obj)
 
-async def get_query_metadata(conn_id, sql_query):
+async def get_query_metadata(conn_id, sql_query, sample_rows=None):
     """
     Analyze a SQL query and produce metadata about the results.
     
+    All column statistics and the row count are computed by a single aggregate
+    query over the user's query, so the query runs once regardless of how many
+    columns it returns.
+    
     Args:
         conn_id: Database connection ID
         sql_query: The SQL query to analyze
+        sample_rows: If set, compute approximate statistics over at most this many rows
     Returns:
         JSON metadata about the query results structure
     """
@@ -48,6 +53,9 @@ async def get_query_metadata(conn_id, sql_query):
         "rowCount": 0,
         "groupBy": []
     }
+    if sample_rows:
+        metadata["sampled"] = True
+        metadata["sampleRows"] = int(sample_rows)
     
     async with db.get_connection(conn_id) as conn:
         # --- Parse query AST ---
@@ -65,36 +73,40 @@ async def get_query_metadata(conn_id, sql_query):
         stmt = await conn.prepare(sql_query)
         column_attrs = stmt.get_attributes()
     
-        for col in column_attrs:
+        # --- Build one aggregate over the query ---
+        # Result columns are renamed positionally (c0, c1, ...) so duplicate or
+        # unusual column names need no quoting
+        aggregates = ["COUNT(*)"]
+        stat_targets = []  # (field_meta, stat name, aggregate positions)
+        for i, col in enumerate(column_attrs):
             logical_type = pg_type_to_logical(col.type)
             field_meta = {"name": col.name, "type": logical_type}
+            metadata["fields"].append(field_meta)
     
-            # Optional: try to get stats
             if logical_type == "nominal":
-                query = f"SELECT COUNT(DISTINCT {col.name}) FROM ({sql_query}) AS subq"
-                try:
-                    result = await conn.fetchval(query)
-                    field_meta["unique"] = result
-                except Exception:
-                    pass
-    
+                # Cast to text so types without an equality operator (json, point, ...) still count
+                aggregates.append(f"COUNT(DISTINCT c{i}::text)")
+                stat_targets.append((field_meta, "unique", [len(aggregates) - 1]))
             elif logical_type == "temporal":
-                query = f"SELECT MIN({col.name}), MAX({col.name}) FROM ({sql_query}) AS subq"
-                try:
-                    result = await conn.fetchrow(query)
-                    if result:
-                        field_meta["range"] = [result[0], result[1]]
-                except Exception:
-                    pass
+                aggregates.append(f"MIN(c{i})")
+                aggregates.append(f"MAX(c{i})")
+                stat_targets.append((field_meta, "range", [len(aggregates) - 2, len(aggregates) - 1]))
     
-            metadata["fields"].append(field_meta)
+        source = f"({sql_query})"
+        if sample_rows:
+            source = f"(SELECT * FROM ({sql_query}) AS src LIMIT {int(sample_rows)})"
+        column_aliases = ", ".join(f"c{i}" for i in range(len(column_attrs)))
+        alias = f"subq({column_aliases})" if column_aliases else "subq"
+        stats_query = f"SELECT {', '.join(aggregates)} FROM {source} AS {alias}"
     
-        # --- Row count ---
         try:
-            result = await conn.fetchval(f"SELECT COUNT(*) FROM ({sql_query}) AS subq")
-            metadata["rowCount"] = result
+            result = await conn.fetchrow(stats_query)
+            metadata["rowCount"] = result[0]
+            for field_meta, stat, positions in stat_targets:
+                values = [result[p] for p in positions]
+                field_meta[stat] = values if stat == "range" else values[0]
         except Exception as e:
-            logger.error(f"Row count failed: {e}")
+            logger.error(f"Metadata aggregation failed: {e}")
 
     return json.dumps(metadata, indent=2, default=default_serializer)
 
@@ -103,16 +115,17 @@ def register_viz_tools():
     logger.debug("Registering vizualization tools")
 
     @mcp.tool()
-    async def pg_metadata(conn_id: str, sql_query: str):
+    async def pg_metadata(conn_id: str, sql_query: str, sample_rows: int | None = None):
         """
         Analyzes a SQL query and produces visualization metadata.
         
         Args:
             conn_id: Connection ID previously obtained from the connect tool
             sql_query: The SQL query to analyze
+            sample_rows: Compute approximate statistics over at most this many rows (optional)
             
         Returns:
             JSON metadata about the query results structure
         """
         # Call the function to get query metadata
-        return await get_query_metadata(conn_id, sql_query)
\ No newline at end of file
+        return await get_query_metadata(conn_id, sql_query, sample_rows)
\ No newline at end of file